@@ -0,0 +1,203 @@
+import time
+import random
+from array import array
+
+
+class Node:
+    def __init__(self, value):
+        self.value = value
+        self.left = None
+        self.right = None
+
+
+# Идентификатор пустого поддерева
+EMPTY = 0
+
+
+class HashConsTable:
+    """
+    Хеш-консинг поддеревьев: каждое различное поддерево (значение, id
+    левого, id правого) получает канонический целый id. Два поддерева
+    равны тогда и только тогда, когда равны их id, - сравнение за O(1)
+    вместо обхода, как в Tree._is_mirror из task1.1.
+
+    Для каждого id сразу хранится id зеркального поддерева: зеркало
+    (v, l, r) - это (v, mirror[r], mirror[l]), а дети получают id раньше
+    родителя, поэтому зеркало вычисляется за O(1) при вставке.
+    Сама таблица - DAG: повторяющееся поддерево хранится один раз.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        # Описание поддерева с номером id; индекс 0 - пустое поддерево.
+        # values - list: значения узлов могут быть любыми (float, большие int)
+        self.values = [None]
+        self.left = array('l', (EMPTY,))
+        self.right = array('l', (EMPTY,))
+        self.mirror = array('l', (EMPTY,))
+        self.sizes = array('q', (0,))
+
+    def __len__(self):
+        """Количество узлов DAG, включая заведенные заранее зеркальные двойники."""
+        return len(self.values) - 1
+
+    def _new(self, key):
+        value, lid, rid = key
+        idx = len(self.values)
+        self.ids[key] = idx
+        self.values.append(value)
+        self.left.append(lid)
+        self.right.append(rid)
+        self.mirror.append(EMPTY)
+        self.sizes.append(self.sizes[lid] + self.sizes[rid] + 1)
+        return idx
+
+    def intern(self, value, lid=EMPTY, rid=EMPTY):
+        """id поддерева с корнем value и детьми lid, rid (создается при первой встрече)."""
+        key = (value, lid, rid)
+        idx = self.ids.get(key)
+        if idx is not None:
+            return idx
+        idx = self._new(key)
+        mirror = self.mirror
+        mirror_key = (value, mirror[rid], mirror[lid])
+        if mirror_key == key:
+            mirror[idx] = idx
+            return idx
+        twin = self.ids.get(mirror_key)
+        if twin is None:
+            twin = self._new(mirror_key)
+        mirror[idx] = twin
+        mirror[twin] = idx
+        return idx
+
+    def add_tree(self, root, visit=None):
+        """
+        Один проход снизу вверх (итеративный, без рекурсии): возвращает id
+        корня. visit(node, id) вызывается для каждого узла - так собираются
+        повторы в find_duplicate_subtrees.
+        """
+        if root is None:
+            return EMPTY
+        order = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            if node.left:
+                stack.append(node.left)
+            if node.right:
+                stack.append(node.right)
+        # В обратном прямом порядке дети обрабатываются раньше родителей
+        node_ids = {}
+        for node in reversed(order):
+            lid = node_ids.pop(id(node.left), EMPTY) if node.left else EMPTY
+            rid = node_ids.pop(id(node.right), EMPTY) if node.right else EMPTY
+            idx = self.intern(node.value, lid, rid)
+            node_ids[id(node)] = idx
+            if visit:
+                visit(node, idx)
+        return node_ids[id(root)]
+
+    # --- Сравнения за O(1) ---
+
+    def equal(self, a, b):
+        return a == b
+
+    def mirror_equal(self, a, b):
+        """Является ли поддерево b зеркальным отражением a."""
+        return self.mirror[a] == b
+
+    def is_symmetric(self, idx):
+        """Симметрично ли дерево (аналог Tree.is_symmetric из task1.1)."""
+        return self.mirror[idx] == idx
+
+    # --- Хранение в виде DAG ---
+
+    def build(self, idx):
+        """Разворачивает поддерево id обратно в дерево из Node."""
+        if idx == EMPTY:
+            return None
+        root = Node(self.values[idx])
+        stack = [(root, idx)]
+        while stack:
+            node, i = stack.pop()
+            lid = self.left[i]
+            rid = self.right[i]
+            if lid != EMPTY:
+                node.left = Node(self.values[lid])
+                stack.append((node.left, lid))
+            if rid != EMPTY:
+                node.right = Node(self.values[rid])
+                stack.append((node.right, rid))
+        return root
+
+
+def find_duplicate_subtrees(roots, min_size=1, mirror=False):
+    """
+    Повторяющиеся поддеревья в лесу: список групп [(номер дерева, узел), ...]
+    по 2 и более одинаковых поддерева размером от min_size узлов.
+    mirror=True объединяет поддерево с его зеркальными копиями.
+    Возвращает (groups, table).
+    """
+    table = HashConsTable()
+    occurrences = {}
+    for tree_idx, root in enumerate(roots):
+        def visit(node, idx, tree_idx=tree_idx):
+            if table.sizes[idx] < min_size:
+                return
+            if mirror:
+                idx = min(idx, table.mirror[idx])
+            occurrences.setdefault(idx, []).append((tree_idx, node))
+        table.add_tree(root, visit)
+    groups = [group for group in occurrences.values() if len(group) > 1]
+    return groups, table
+
+
+# --- Демонстрация ---
+
+def random_tree(n, values=3):
+    """Случайное дерево из n узлов с малым набором значений - много повторов."""
+    nodes = [Node(random.randint(0, values - 1)) for _ in range(n)]
+    for i in range(1, n):
+        parent = nodes[random.randint(0, i - 1)]
+        if parent.left is None:
+            parent.left = nodes[i]
+        elif parent.right is None:
+            parent.right = nodes[i]
+        else:
+            prev = nodes[i - 1]
+            if prev.left is None:
+                prev.left = nodes[i]
+            else:
+                prev.right = nodes[i]
+    return nodes[0]
+
+
+if __name__ == "__main__":
+    #      1          1
+    #     / \        / \
+    #    2   3      3   2
+    a = Node(1)
+    a.left, a.right = Node(2), Node(3)
+    b = Node(1)
+    b.left, b.right = Node(3), Node(2)
+    table = HashConsTable()
+    ida = table.add_tree(a)
+    idb = table.add_tree(b)
+    print(f"Равны: {table.equal(ida, idb)}, зеркальны: {table.mirror_equal(ida, idb)}")
+
+    forest = [random_tree(2000) for _ in range(50)]
+    total = 50 * 2000
+    start = time.perf_counter()
+    groups, table = find_duplicate_subtrees(forest, min_size=5)
+    elapsed = time.perf_counter() - start
+    mirror_groups, _ = find_duplicate_subtrees(forest, min_size=5, mirror=True)
+    print(f"Лес: 50 деревьев, {total} узлов, проход {elapsed:.3f} сек")
+    distinct = set()
+    dag = HashConsTable()
+    for root in forest:
+        dag.add_tree(root, lambda node, idx: distinct.add(idx))
+    print(f"Различных поддеревьев: {len(distinct)} (сжатие {total / len(distinct):.2f}x), "
+          f"узлов DAG вместе с зеркалами: {len(dag)}")
+    print(f"Групп повторов от 5 узлов: {len(groups)}, с учетом зеркал: {len(mirror_groups)}")
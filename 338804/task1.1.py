@@ -3,6 +3,7 @@ import random
 import matplotlib.pyplot as plt
 from array import array
 import sys
+from hash_consing import HashConsTable, EMPTY
 
 # Увеличим лимит рекурсии для глубоких деревьев
 sys.setrecursionlimit(20000)
@@ -13,28 +14,109 @@ class Node:
         self.left = None
         self.right = None
 
+def _fp(node):
+    return node.fp if node else EMPTY
+
 class Tree:
     def __init__(self):
         self.root = None
+        # Таблица хеш-консинга (hash_consing.py), пока включены отпечатки
+        self.table = None
+
+    @property
+    def fingerprints(self):
+        return self.table is not None
 
     def is_symmetric(self):
         if not self.root:
             return True
+        if self.table is not None:
+            # O(1) и без ложных совпадений: отпечаток - канонический id
+            # поддерева, а не хеш, поэтому равные id - равные поддеревья
+            return self.table.mirror[_fp(self.root.left)] == _fp(self.root.right)
         return self._is_mirror(self.root.left, self.root.right)
 
     def _is_mirror(self, t1, t2):
-        # Если оба узла отсутствуют - симметрично
-        if not t1 and not t2:
-            return True
-        # Если отсутствует только один или значения разные - не симметрично
-        if not t1 or not t2:
-            return False
-        if t1.value != t2.value:
-            return False
-        
-        # Рекурсивная проверка: лево-право и право-лево
-        return (self._is_mirror(t1.left, t2.right) and 
-                self._is_mirror(t1.right, t2.left))
+        # Стек пар узлов, которые должны быть зеркальны друг другу;
+        # выход на первом же несовпадении
+        pairs = [(t1, t2)]
+        while pairs:
+            t1, t2 = pairs.pop()
+            # Если оба узла отсутствуют - симметрично
+            if not t1 and not t2:
+                continue
+            # Если отсутствует только один или значения разные - не симметрично
+            if not t1 or not t2:
+                return False
+            if t1.value != t2.value:
+                return False
+            # Дальше сравниваются лево-право и право-лево
+            pairs.append((t1.right, t2.left))
+            pairs.append((t1.left, t2.right))
+        return True
+
+    # --- Кешированные отпечатки поддеревьев ---
+
+    def enable_fingerprints(self):
+        """
+        Дает каждому узлу ссылку на родителя и отпечаток fp - id поддерева
+        в HashConsTable, O(N). Атрибуты parent и fp появляются у узлов
+        только здесь. Таблица только растет (старые id после правок
+        остаются), disable_fingerprints ее освобождает.
+        """
+        self.table = HashConsTable()
+        if self.root:
+            self.root.parent = None
+            self._init_subtree(self.root)
+
+    def disable_fingerprints(self):
+        self.table = None
+
+    def _init_subtree(self, top):
+        # Прямой порядок; в обратном - дети раньше родителей
+        order = []
+        stack = [top]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            for child in (node.left, node.right):
+                if child:
+                    child.parent = node
+                    stack.append(child)
+        intern = self.table.intern
+        for node in reversed(order):
+            node.fp = intern(node.value, _fp(node.left), _fp(node.right))
+
+    def _refresh_up(self, node):
+        """Пересчет отпечатков от node до корня, O(глубины)."""
+        intern = self.table.intern
+        while node:
+            fp = intern(node.value, _fp(node.left), _fp(node.right))
+            # Тот же id - то же поддерево, выше ничего не меняется
+            if fp == node.fp:
+                break
+            node.fp = fp
+            node = node.parent
+
+    # Изменения дерева при включенных отпечатках должны идти через эти
+    # методы: прямое присваивание node.value/left/right кеш не обновляет
+
+    def set_value(self, node, value):
+        node.value = value
+        if self.table is not None:
+            self._refresh_up(node)
+
+    def set_child(self, parent, child, is_left=True):
+        """Подвешивает поддерево child (или None - удаляет) к parent."""
+        if is_left:
+            parent.left = child
+        else:
+            parent.right = child
+        if self.table is not None:
+            if child:
+                child.parent = parent
+                self._init_subtree(child)
+            self._refresh_up(parent)
 
 # Вспомогательная функция для сборки дерева без использования списков
 def build_perfect_symmetric_tree(depth, val=1):
@@ -128,4 +210,51 @@ def manual_test():
     t3.root.left.right = Node(3)
     print(f"Test 3 (Structure differ): {t3.is_symmetric()}") # False
 
-manual_test()
\ No newline at end of file
+manual_test()
+
+def fingerprint_test():
+    print("\n--- Кешированные отпечатки ---")
+    tree = Tree()
+    tree.root = build_perfect_symmetric_tree(16)
+    repeats = 1000
+
+    start = time.perf_counter()
+    for _ in range(10):
+        tree.is_symmetric()
+    walk_time = (time.perf_counter() - start) / 10
+
+    tree.enable_fingerprints()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        tree.is_symmetric()
+    cached_time = (time.perf_counter() - start) / repeats
+
+    # Локальная правка листа и обратно: пересчет только пути до корня
+    leaf = tree.root
+    while leaf.left:
+        leaf = leaf.left
+    start = time.perf_counter()
+    tree.set_value(leaf, 2)
+    broken = tree.is_symmetric()
+    tree.set_value(leaf, 1)
+    restored = tree.is_symmetric()
+    edit_time = (time.perf_counter() - start) / 2
+
+    print(f"Nodes: {2**16 - 1}")
+    print(f"Обход: {walk_time:.6f} s, отпечатки: {cached_time:.8f} s на вызов")
+    print(f"Правка листа + проверка: {edit_time:.8f} s ({broken} -> {restored})")
+
+    # hash(-1) == hash(-2) в CPython: хеш-отпечатки назвали бы это дерево
+    # симметричным, id поддеревьев - нет
+    #      0
+    #    /   \
+    #  -1     -2
+    t = Tree()
+    t.root = Node(0)
+    t.root.left = Node(-1)
+    t.root.right = Node(-2)
+    t.enable_fingerprints()
+    print(f"0 / -1 -2: отпечатки {t.is_symmetric()}, обход {t._is_mirror(t.root.left, t.root.right)}") # False False
+
+if __name__ == '__main__':
+    fingerprint_test()
\ No newline at end of file
@@ -1,4 +1,6 @@
 import sys
+import time
+from array import array
 
 # Увеличим лимит рекурсии на случай глубоких деревьев
 sys.setrecursionlimit(10000)
@@ -8,18 +10,164 @@ class Node:
         self.value = value
         self.left = None
         self.right = None
+        # Кешированная сводка поддерева (заполняется при enable_tracking)
+        self.parent = None
+        self.height = 1
+        self.min = value
+        self.max = value
+        self.flags = 0
+
+# Флаги сводки поддерева (битовая маска в Node.flags)
+_BST = 1          # структурно BST (без учета диапазона [c, d])
+_COMPLETE = 2
+_PERFECT = 4
+_MIN_ORDERED = 8
+_MAX_ORDERED = 16
+# Сводка пустого поддерева - как базовый случай _analyze
+_EMPTY_FLAGS = _BST | _COMPLETE | _PERFECT | _MIN_ORDERED | _MAX_ORDERED
+
+def _summarize(node):
+    """
+    Пересчитывает сводку узла по сводкам детей - те же формулы, что в
+    _analyze, но за O(1). Возвращает True, если сводка изменилась.
+    """
+    value = node.value
+    left = node.left
+    right = node.right
+    if left:
+        l_h, l_min, l_max, l_f = left.height, left.min, left.max, left.flags
+    else:
+        l_h, l_min, l_max, l_f = 0, value, value, _EMPTY_FLAGS
+    if right:
+        r_h, r_min, r_max, r_f = right.height, right.min, right.max, right.flags
+    else:
+        r_h, r_min, r_max, r_f = 0, value, value, _EMPTY_FLAGS
+
+    flags = 0
+    if (l_f & r_f & _BST and (not left or l_max < value) and
+            (not right or value < r_min)):
+        flags |= _BST
+    if l_f & r_f & _PERFECT and l_h == r_h:
+        flags |= _PERFECT
+    if ((l_f & _PERFECT and r_f & _COMPLETE and l_h == r_h) or
+            (l_f & _COMPLETE and r_f & _PERFECT and l_h == r_h + 1)):
+        flags |= _COMPLETE
+    if (l_f & r_f & _MIN_ORDERED and (not left or value <= left.value) and
+            (not right or value <= right.value)):
+        flags |= _MIN_ORDERED
+    if (l_f & r_f & _MAX_ORDERED and (not left or value >= left.value) and
+            (not right or value >= right.value)):
+        flags |= _MAX_ORDERED
+
+    height = max(l_h, r_h) + 1
+    lo = min(value, l_min, r_min)
+    hi = max(value, l_max, r_max)
+    changed = (height != node.height or lo != node.min or hi != node.max or
+               flags != node.flags)
+    node.height, node.min, node.max, node.flags = height, lo, hi, flags
+    return changed
+
+def _summarize_flat(root):
+    """
+    Сводка всего дерева (height, min, max, flags) по тем же формулам, что
+    _summarize, но без полей узлов: дерево раскладывается по уровням в
+    массивы индексов детей (-1 - нет ребенка), индекс ребенка больше
+    индекса родителя, и проход с конца видит детей раньше родителей.
+    Результаты поддеревьев лежат в заранее выделенных массивах.
+    """
+    order = [root]
+    left = array('i')
+    right = array('i')
+    # Список растет во время прохода по нему - это и есть очередь обхода
+    for node in order:
+        if node.left:
+            left.append(len(order))
+            order.append(node.left)
+        else:
+            left.append(-1)
+        if node.right:
+            right.append(len(order))
+            order.append(node.right)
+        else:
+            right.append(-1)
+    vals = [node.value for node in order]
+    try:
+        vals = array('q', vals)
+    except (TypeError, OverflowError):
+        # float и целые вне 64 бит остаются в списке
+        pass
+    n = len(vals)
+
+    # Значения по умолчанию - это сводка листа
+    height = array('i', [1]) * n
+    sub_min = vals[:]
+    sub_max = vals[:]
+    flags = array('B', [_EMPTY_FLAGS]) * n
+    ordered = _BST | _MIN_ORDERED | _MAX_ORDERED
+    for i in range(n - 1, -1, -1):
+        l = left[i]
+        r = right[i]
+        if l < 0 and r < 0:
+            continue
+        val = vals[i]
+        f = ordered
+        l_h = r_h = 0
+        l_f = r_f = _EMPTY_FLAGS
+        if l >= 0:
+            l_h = height[l]
+            l_f = flags[l]
+            if not sub_max[l] < val:
+                f &= ~_BST
+            if vals[l] < val:
+                f &= ~_MIN_ORDERED
+            elif vals[l] > val:
+                f &= ~_MAX_ORDERED
+            if sub_min[l] < sub_min[i]:
+                sub_min[i] = sub_min[l]
+            if sub_max[l] > sub_max[i]:
+                sub_max[i] = sub_max[l]
+        if r >= 0:
+            r_h = height[r]
+            r_f = flags[r]
+            if not val < sub_min[r]:
+                f &= ~_BST
+            if vals[r] < val:
+                f &= ~_MIN_ORDERED
+            elif vals[r] > val:
+                f &= ~_MAX_ORDERED
+            if sub_min[r] < sub_min[i]:
+                sub_min[i] = sub_min[r]
+            if sub_max[r] > sub_max[i]:
+                sub_max[i] = sub_max[r]
+
+        both = l_f & r_f
+        f &= both
+        if l_h == r_h:
+            if both & _PERFECT:
+                f |= _COMPLETE | _PERFECT
+            elif l_f & _PERFECT and r_f & _COMPLETE:
+                f |= _COMPLETE
+        elif l_h == r_h + 1 and l_f & _COMPLETE and r_f & _PERFECT:
+            f |= _COMPLETE
+        height[i] = (l_h if l_h > r_h else r_h) + 1
+        flags[i] = f
+    return height[0], sub_min[0], sub_max[0], flags[0]
 
 class Tree:
     def __init__(self, root_node=None):
         self.root = root_node
+        self.tracking = False
 
     def validate_properties(self, c, d, A, B):
         """
         Проверяет все условия за один проход.
         Возвращает: (is_bst, is_min_heap, is_max_heap)
+        При включенном отслеживании (enable_tracking) - за O(1) по сводке корня.
         """
-        # Запускаем рекурсивный анализ
-        res = self._analyze(self.root, c, d)
+        if self.tracking:
+            return self._validate_cached(c, d, A, B)
+        # Запускаем анализ (итеративный, результаты узлов - в массивах)
+        res = self._analyze_flat(c, d)
         
         height = res[5]
         is_height_ok = A < height < B
@@ -34,6 +182,120 @@ class Tree:
         
         return is_bst, is_min_heap, is_max_heap
 
+    # --- Изменяемое дерево с кешированными сводками ---
+
+    def enable_tracking(self):
+        """
+        Один раз считает сводки всех узлов (итеративно, O(N)) и ссылки на
+        родителей. Дальше дерево меняется через insert_child, replace_value
+        и detach - они пересчитывают только путь до корня, O(высоты).
+        Прямое присваивание node.left/right/value сводки не обновляет.
+        """
+        self.tracking = True
+        if not self.root:
+            return
+        self.root.parent = None
+        order = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            for child in (node.left, node.right):
+                if child:
+                    child.parent = node
+                    stack.append(child)
+        # В обратном прямом порядке дети обрабатываются раньше родителей
+        for node in reversed(order):
+            _summarize(node)
+
+    def _refresh_up(self, node, force=1):
+        """
+        Пересчет сводок от node к корню. Первые force узлов пересчитываются
+        всегда (у родителя меняется проверка порядка кучи, даже если сводка
+        самого узла не изменилась), дальше - пока сводки меняются.
+        """
+        while node:
+            if not _summarize(node) and force <= 0:
+                break
+            force -= 1
+            node = node.parent
+
+    def insert_child(self, parent, value, is_left=True):
+        """Добавляет лист со значением value на свободное место parent."""
+        if (parent.left if is_left else parent.right) is not None:
+            raise ValueError("Место для ребенка уже занято")
+        child = Node(value)
+        child.parent = parent
+        if is_left:
+            parent.left = child
+        else:
+            parent.right = child
+        if self.tracking:
+            _summarize(child)
+            self._refresh_up(parent)
+        return child
+
+    def replace_value(self, node, value):
+        node.value = value
+        if self.tracking:
+            self._refresh_up(node, force=2)
+
+    def detach(self, node):
+        """Отрезает поддерево node от дерева и возвращает его."""
+        parent = node.parent if self.tracking else self._find_parent(node)
+        if parent is None:
+            if node is self.root:
+                self.root = None
+            return node
+        if parent.left is node:
+            parent.left = None
+        else:
+            parent.right = None
+        node.parent = None
+        if self.tracking:
+            self._refresh_up(parent)
+        return node
+
+    def _find_parent(self, target):
+        # Без отслеживания ссылок на родителей нет - ищем обходом
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            for child in (node.left, node.right):
+                if child is target:
+                    return node
+                if child:
+                    stack.append(child)
+        return None
+
+    def _validate_cached(self, c, d, A, B):
+        root = self.root
+        if not root:
+            height, flags, in_range = 0, _EMPTY_FLAGS, True
+        else:
+            height, flags = root.height, root.flags
+            in_range = c <= root.min and root.max <= d
+        is_height_ok = A < height < B
+        is_bst = bool(flags & _BST) and in_range and is_height_ok
+        is_complete = bool(flags & _COMPLETE)
+        is_min_heap = is_complete and bool(flags & _MIN_ORDERED) and is_height_ok
+        is_max_heap = is_complete and bool(flags & _MAX_ORDERED) and is_height_ok
+        return is_bst, is_min_heap, is_max_heap
+
+    def _analyze_flat(self, c, d):
+        """
+        Итеративный аналог _analyze: возвращает такой же кортеж, но только
+        для корня. Высота, мин/макс и флаги считаются одним проходом снизу
+        вверх (_summarize_flat) - без кортежа и float('inf') на каждый узел.
+        """
+        if not self.root:
+            return self._analyze(None, c, d)
+        height, lo, hi, f = _summarize_flat(self.root)
+        within_range = c <= lo and hi <= d
+        return (bool(f & _BST) and within_range, lo, hi,
+                bool(f & _COMPLETE), bool(f & _PERFECT), height,
+                bool(f & _MIN_ORDERED), bool(f & _MAX_ORDERED), within_range)
+
     def _analyze(self, node, c, d):
         """
         Рекурсивная функция. Возвращает кортеж:
@@ -140,4 +402,62 @@ def test_trees():
     print("Дерево 4 (Высота 1, A=1):", t4.validate_properties(0, 100, 1, 5))
     # Ожидаем: (False, False, False) так как 1 не > 1
 
-test_trees()
\ No newline at end of file
+test_trees()
+
+def _complete_heap(n):
+    """Узлы полной min-кучи из n узлов (значения 0..n-1 по уровням)."""
+    nodes = [Node(i) for i in range(n)]
+    for i in range(n):
+        if 2 * i + 1 < n:
+            nodes[i].left = nodes[2 * i + 1]
+        if 2 * i + 2 < n:
+            nodes[i].right = nodes[2 * i + 2]
+    return nodes
+
+def test_incremental():
+    print("\n--- Изменения с пересчетом пути до корня ---")
+    # Полная min-куча из 2^16 - 1 узлов
+    n = 2**16 - 1
+    nodes = _complete_heap(n)
+    tree = Tree(nodes[0])
+    c, d, A, B = 0, n, 0, 20
+
+    start = time.perf_counter()
+    full = tree.validate_properties(c, d, A, B)
+    full_time = time.perf_counter() - start
+
+    tree.enable_tracking()
+    leaf = nodes[n - 1]
+    start = time.perf_counter()
+    tree.replace_value(leaf, -1)             # нарушает порядок кучи
+    broken = tree.validate_properties(c, d, A, B)
+    tree.replace_value(leaf, n - 1)
+    restored = tree.validate_properties(c, d, A, B)
+    tree.detach(leaf)                        # дерево остается полным
+    detached = tree.validate_properties(c, d, A, B)
+    edit_time = (time.perf_counter() - start) / 3
+
+    print(f"N={n}: полный проход {full}, {full_time:.5f} сек")
+    print(f"После правок: {broken} -> {restored} -> {detached}, "
+          f"{edit_time:.7f} сек на правку и проверку")
+
+
+def benchmark_analyzers(n=200000):
+    """
+    _analyze (кортеж из 9 полей на узел) против _analyze_flat на полной
+    min-куче из n узлов: все проверки идут до корня, результаты должны
+    совпасть.
+    """
+    print(f"\n--- Анализаторы свойств, N={n} ---")
+    tree = Tree(_complete_heap(n)[0])
+    for name, func, args in (("кортежи (рекурсия)", tree._analyze, (tree.root, 0, n)),
+                             ("массивы", tree._analyze_flat, (0, n))):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<20} {elapsed:.4f} сек")
+    print(f"Результаты совпадают: {tree._analyze(tree.root, 0, n) == tree._analyze_flat(0, n)}")
+
+if __name__ == '__main__':
+    test_incremental()
+    benchmark_analyzers()
\ No newline at end of file
@@ -14,6 +14,62 @@ class Node:
         self.left = None
         self.right = None
 
+class PathsResult:
+    """
+    Найденные пути без копирования: значения и родители узлов, лежащих на
+    путях к подходящим листьям (общие начала путей хранятся один раз), и
+    индексы самих листьев. Путь от корня до листа собирается по требованию,
+    поэтому len() или первые несколько путей не стоят O(N*H) памяти.
+    Поддерживает len(), итерацию (пути как array('l')), индексацию и срезы.
+    """
+    __slots__ = ['vals', 'parent', 'leaves']
+
+    def __init__(self, vals=None, parent=None, leaves=None):
+        self.vals = array('l') if vals is None else vals
+        self.parent = array('l') if parent is None else parent
+        self.leaves = array('l') if leaves is None else leaves
+
+    def add_leaf(self, path_vals, path_idx):
+        """
+        Запоминает лист в конце текущего пути. path_idx[k] - индекс k-го
+        узла пути в vals или -1, если он еще не записан; записанные узлы
+        всегда образуют начало пути, дописываются только остальные.
+        """
+        k = len(path_idx) - 1
+        while k >= 0 and path_idx[k] < 0:
+            k -= 1
+        par = path_idx[k] if k >= 0 else -1
+        for j in range(k + 1, len(path_idx)):
+            path_idx[j] = len(self.vals)
+            self.vals.append(path_vals[j])
+            self.parent.append(par)
+            par = path_idx[j]
+        self.leaves.append(par)
+
+    def path(self, leaf):
+        """Путь от корня до узла с индексом leaf (новый array)."""
+        path = array('l')
+        while leaf >= 0:
+            path.append(self.vals[leaf])
+            leaf = self.parent[leaf]
+        path.reverse()
+        return path
+
+    def __len__(self):
+        return len(self.leaves)
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return PathsResult(self.vals, self.parent, self.leaves[k])
+        return self.path(self.leaves[k])
+
+    def __iter__(self):
+        for leaf in self.leaves:
+            yield self.path(leaf)
+
+    def __repr__(self):
+        return f"PathsResult({len(self.leaves)} paths)"
+
 class Tree:
     def __init__(self):
         self.root = None
@@ -22,38 +78,44 @@ class Tree:
         """
         Находит все пути от корня до листа, сумма значений которых лежит в [a, b].
         Использует array вместо list для текущего пути.
+        Пути не копируются: возвращается PathsResult, который хранит только
+        узлы найденных путей и собирает каждый путь по требованию.
         """
-        results = [] # Здесь будем хранить найденные пути (массивы)
-        
+        results = PathsResult() # Здесь будем хранить найденные пути
+
         # 'l' - signed long (минимум 4 байта), подходит для целых чисел
-        current_path = array('l') 
-        
+        current_path = array('l')
+        # Индексы узлов текущего пути в results (-1 - еще не записан)
+        path_idx = array('l')
+
         if self.root is None:
             return results
 
-        self._dfs(self.root, 0, current_path, results, a, b)
+        self._dfs(self.root, 0, current_path, path_idx, results, a, b)
         return results
 
-    def _dfs(self, node, current_sum, current_path, results, a, b):
+    def _dfs(self, node, current_sum, current_path, path_idx, results, a, b):
         # 1. Добавляем текущий узел в путь и обновляем сумму
         current_sum += node.value
         current_path.append(node.value)
+        path_idx.append(-1)
 
         # 2. Проверяем, является ли узел листом
         if node.left is None and node.right is None:
             if a <= current_sum <= b:
-                # Если условие выполнено, сохраняем копию текущего пути
-                # (создаем новый array на основе старого)
-                results.append(array('l', current_path))
+                # Если условие выполнено, запоминаем лист (и еще не
+                # записанных предков), а не копию всего пути
+                results.add_leaf(current_path, path_idx)
         else:
             # 3. Рекурсивный обход
             if node.left:
-                self._dfs(node.left, current_sum, current_path, results, a, b)
+                self._dfs(node.left, current_sum, current_path, path_idx, results, a, b)
             if node.right:
-                self._dfs(node.right, current_sum, current_path, results, a, b)
+                self._dfs(node.right, current_sum, current_path, path_idx, results, a, b)
 
         # 4. Backtracking: удаляем текущий узел из пути перед возвратом на уровень выше
         current_path.pop()
+        path_idx.pop()
 
 # --- Вспомогательные функции для генерации деревьев ---
 
@@ -1,6 +1,7 @@
 import time
 import random
 from array import array
+from bisect import bisect_left, bisect_right
 import matplotlib.pyplot as plt
 
 # Класс узла дерева
@@ -10,6 +11,36 @@ class Node:
         self.left = None
         self.right = None
 
+# Дерево Фенвика над сжатыми префиксными суммами: сколько префиксов
+# текущего пути попадает в диапазон - за O(log N)
+def _fenwick_add(fen, i, delta):
+    """Добавляет delta к элементу i (нумерация с 0)."""
+    i += 1
+    n = len(fen)
+    while i < n:
+        fen[i] += delta
+        i += i & -i
+
+def _fenwick_sum(fen, i):
+    """Сумма элементов с номерами < i."""
+    total = 0
+    while i > 0:
+        total += fen[i]
+        i -= i & -i
+    return total
+
+def _fenwick_find(fen, k):
+    """Наименьший номер i, для которого _fenwick_sum(fen, i + 1) >= k."""
+    pos = 0
+    step = 1 << (len(fen) - 1).bit_length()
+    while step:
+        nxt = pos + step
+        if nxt < len(fen) and fen[nxt] < k:
+            pos = nxt
+            k -= fen[nxt]
+        step >>= 1
+    return pos
+
 # Класс бинарного дерева
 class Tree:
     def __init__(self, root_val=None):
@@ -23,32 +54,219 @@ class Tree:
         Запускает поиск путей от корня до листа с суммой N.
         Использует генератор для возврата путей без создания списка.
         """
-        # Используем array('i') для хранения текущего пути (целые числа)
-        current_path = array('i')
-        return self._dfs_search(self.root, target_sum, 0, current_path)
+        return self._dfs_search(self.root, target_sum)
 
-    def _dfs_search(self, node, target, current_sum, path):
-        if node is None:
+    def _dfs_search(self, root, target):
+        """
+        Итеративный обход с явным стеком: в отличие от цепочки вложенных
+        yield from, выдача пути не проходит через O(глубины) генераторов,
+        а глубина дерева не ограничена лимитом рекурсии.
+        """
+        if root is None:
             return
 
-        # Добавляем значение текущего узла
-        current_sum += node.value
-        path.append(node.value)
+        # Используем array('i') для хранения текущего пути (целые числа)
+        path = array('i')
+        # Отложенные правые ветки: узел, глубина, сумма пути до родителя
+        pending = []
+        pending_depth = array('i')
+        pending_sum = []
+
+        node = root
+        depth = 0
+        current_sum = 0
+        while True:
+            # Добавляем значение текущего узла
+            current_sum += node.value
+            path.append(node.value)
+
+            # Проверка: является ли узел листом
+            if node.left is None and node.right is None:
+                if current_sum == target:
+                    # Возвращаем копию текущего пути как новый array
+                    yield array('i', path)
+            else:
+                depth += 1
+                if node.left is not None:
+                    if node.right is not None:
+                        pending.append(node.right)
+                        pending_depth.append(depth)
+                        pending_sum.append(current_sum)
+                    node = node.left
+                else:
+                    node = node.right
+                continue
+
+            if not pending:
+                return
+            node = pending.pop()
+            depth = pending_depth.pop()
+            current_sum = pending_sum.pop()
+            # Бэктрекинг (откат): в пути остаются только предки нового узла
+            del path[depth:]
+
+    def _prefix_keys(self):
+        """
+        Отсортированные различные префиксные суммы всех узлов (от корня) и
+        0 - координаты для дерева Фенвика. Итеративный обход, O(N log N).
+        """
+        sums = array('q', (0,))
+        stack = [self.root]
+        stack_sum = array('q', (0,))
+        while stack:
+            node = stack.pop()
+            p = stack_sum.pop() + node.value
+            sums.append(p)
+            for child in (node.left, node.right):
+                if child is not None:
+                    stack.append(child)
+                    stack_sum.append(p)
+        return array('q', sorted(set(sums)))
+
+    def count_downward_paths_with_sum(self, target, upper=None):
+        """
+        Считает все нисходящие пути (от любого узла вниз, не обязательно до
+        листа) с суммой, равной target, или в [target, upper], если upper задан.
 
-        # Проверка: является ли узел листом
-        is_leaf = node.left is None and node.right is None
+        Один итеративный обход: для узла с префиксной суммой P (от корня)
+        путь, начинающийся в предке j, имеет сумму P - prefix[j]. Префиксы
+        текущего пути лежат в словаре-счетчике (равенство, O(N) в среднем)
+        или в дереве Фенвика над сжатыми префиксами (диапазон): запрос,
+        добавление и откат - O(log N), всего O(N log N) при любой высоте.
+        """
+        if self.root is None or (upper is not None and upper < target):
+            return 0
 
-        if is_leaf:
-            if current_sum == target:
-                # Возвращаем копию текущего пути как новый array
-                yield array('i', path)
+        ranged = upper is not None
+        if ranged:
+            keys = self._prefix_keys()
+            # Сколько раз каждый сжатый префикс встречается на текущем пути
+            on_path = array('i', [0]) * (len(keys) + 1)
+            _fenwick_add(on_path, bisect_left(keys, 0), 1)
+            # Номера префиксов текущего пути - для отката
+            prefix_key = array('i', (bisect_left(keys, 0),))
         else:
-            # Рекурсивный обход детей
-            yield from self._dfs_search(node.left, target, current_sum, path)
-            yield from self._dfs_search(node.right, target, current_sum, path)
+            on_path = {0: 1}
+        # prefix[j] - сумма первых j узлов текущего пути
+        prefix = array('q', (0,))
+        pending = []
+        pending_depth = array('i')
+        count = 0
+
+        node = self.root
+        depth = 0
+        while True:
+            p = prefix[-1] + node.value
+            if ranged:
+                count += (_fenwick_sum(on_path, bisect_right(keys, p - target)) -
+                          _fenwick_sum(on_path, bisect_left(keys, p - upper)))
+                key = bisect_left(keys, p)
+                _fenwick_add(on_path, key, 1)
+                prefix_key.append(key)
+            else:
+                count += on_path.get(p - target, 0)
+                on_path[p] = on_path.get(p, 0) + 1
+            prefix.append(p)
+
+            if node.left is not None or node.right is not None:
+                depth += 1
+                if node.left is not None:
+                    if node.right is not None:
+                        pending.append(node.right)
+                        pending_depth.append(depth)
+                    node = node.left
+                else:
+                    node = node.right
+                continue
+
+            if not pending:
+                return count
+            node = pending.pop()
+            depth = pending_depth.pop()
+            # Откат: убираем из счетчика префиксы узлов, ушедших из пути
+            for k in range(len(prefix) - 1, depth, -1):
+                if ranged:
+                    _fenwick_add(on_path, prefix_key[k], -1)
+                else:
+                    on_path[prefix[k]] -= 1
+            del prefix[depth + 1:]
+            if ranged:
+                del prefix_key[depth + 1:]
+
+    def iter_downward_paths_with_sum(self, target, upper=None):
+        """
+        Перечисляет нисходящие пути с суммой target (или в [target, upper]).
+        Префиксы текущего пути учитываются в дереве Фенвика над сжатыми
+        префиксами, а для каждого префикса хранится стек позиций на пути.
+        Подходящие значения находятся за O(log N) каждое, поэтому весь
+        обход - O(N log N) плюс размер ответа; каждый путь - это срез
+        текущего пути (новый array). Порядок: по возрастанию префикса,
+        затем позиции начала.
+        """
+        if self.root is None:
+            return
+        if upper is None:
+            upper = target
+        if upper < target:
+            return
+
+        keys = self._prefix_keys()
+        on_path = array('i', [0]) * (len(keys) + 1)
+        # Сжатый префикс -> позиции (начала путей) на текущем пути
+        positions = {}
+        key = bisect_left(keys, 0)
+        _fenwick_add(on_path, key, 1)
+        positions[key] = array('i', (0,))
+        prefix = array('q', (0,))
+        prefix_key = array('i', (key,))
+        path = array('i')
+        pending = []
+        pending_depth = array('i')
 
-        # Бэктрекинг (откат): удаляем узел из пути при возврате на уровень выше
-        path.pop()
+        node = self.root
+        depth = 0
+        while True:
+            path.append(node.value)
+            p = prefix[-1] + node.value
+            seen = _fenwick_sum(on_path, bisect_left(keys, p - upper))
+            last = _fenwick_sum(on_path, bisect_right(keys, p - target))
+            while seen < last:
+                starts = positions[_fenwick_find(on_path, seen + 1)]
+                for start in starts:
+                    yield array('i', path[start:])
+                seen += len(starts)
+            key = bisect_left(keys, p)
+            _fenwick_add(on_path, key, 1)
+            if key in positions:
+                positions[key].append(depth + 1)
+            else:
+                positions[key] = array('i', (depth + 1,))
+            prefix.append(p)
+            prefix_key.append(key)
+
+            if node.left is not None or node.right is not None:
+                depth += 1
+                if node.left is not None:
+                    if node.right is not None:
+                        pending.append(node.right)
+                        pending_depth.append(depth)
+                    node = node.left
+                else:
+                    node = node.right
+                continue
+
+            if not pending:
+                return
+            node = pending.pop()
+            depth = pending_depth.pop()
+            # Откат: последняя позиция префикса - самая глубокая на пути
+            for k in range(len(prefix) - 1, depth, -1):
+                key = prefix_key[k]
+                _fenwick_add(on_path, key, -1)
+                positions[key].pop()
+            del prefix[depth + 1:]
+            del prefix_key[depth + 1:]
+            del path[depth:]
 
 # Вспомогательная функция для построения случайного дерева заданного размера
 def build_random_tree(n):
@@ -70,6 +288,27 @@ def build_random_tree(n):
 
 # --- Тестирование и Анализ сложности ---
 
+# Нисходящие пути с любым началом и суммой 8:
+#         10
+#        /  \
+#       5    -3
+#      / \     \
+#     3   2    11
+#    / \   \
+#   3  -2   1
+demo = Tree(10)
+demo.root.left = Node(5)
+demo.root.right = Node(-3)
+demo.root.left.left = Node(3)
+demo.root.left.right = Node(2)
+demo.root.right.right = Node(11)
+demo.root.left.left.left = Node(3)
+demo.root.left.left.right = Node(-2)
+demo.root.left.right.right = Node(1)
+print("Нисходящих путей с суммой 8:", demo.count_downward_paths_with_sum(8))  # 3
+print("Пути:", [p.tolist() for p in demo.iter_downward_paths_with_sum(8)])
+print("С суммой в [7, 8]:", demo.count_downward_paths_with_sum(7, 8))
+
 sizes = array('i', [100, 500, 1000, 2000, 5000, 10000, 15000, 20000])
 times = array('f')
 
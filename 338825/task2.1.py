@@ -1,3 +1,4 @@
+import time
 from array import array
 
 class Node:
@@ -6,11 +7,126 @@ class Node:
         self.left = None
         self.right = None
 
+# Битовые флаги поддерева в _summarize_flat
+_LINEAR = 1      # у каждого узла не больше одного ребенка
+_COMPLETE = 2    # полное дерево (структура кучи)
+_PERFECT = 4     # все уровни заполнены целиком
+_MIN = 8         # родитель <= детей
+_MAX = 16        # родитель >= детей
+_ALL = _LINEAR | _COMPLETE | _PERFECT | _MIN | _MAX
+
 class TreeChecker:
     @staticmethod
     def check_properties(root, c, d, A, B):
         """
         Возвращает (is_linear_list, is_heap)
+
+        Высота, min/max и флаги структуры считаются одним проходом снизу
+        вверх (_summarize_flat) - без рекурсии и кортежа на узел.
+        """
+        height, lo, hi, flags = TreeChecker._summarize_flat(root)
+
+        # 1) Проверка на линейный список в диапазоне [c, d]
+        check_1 = bool(flags & _LINEAR) and c <= lo and hi <= d
+
+        # 2) Проверка на кучу с высотой (A, B)
+        # Куча = (MinOrder или MaxOrder) + Структура полного дерева + Высота
+        check_2 = bool(flags & (_MIN | _MAX)) and bool(flags & _COMPLETE) and (A < height < B)
+
+        return check_1, check_2
+
+    @staticmethod
+    def _summarize_flat(root):
+        """
+        (height, min, max, flags) дерева. Узлы раскладываются по уровням в
+        массивы индексов детей (-1 - нет ребенка); индекс ребенка больше
+        индекса родителя, поэтому проход с конца видит детей раньше
+        родителей. Результаты поддеревьев лежат в заранее выделенных
+        массивах. Пустое дерево: (0, inf, -inf, все флаги).
+        """
+        if root is None:
+            return 0, float('inf'), float('-inf'), _ALL
+        order = [root]
+        left = array('i')
+        right = array('i')
+        # Список растет во время прохода по нему - это и есть очередь обхода
+        for node in order:
+            if node.left is not None:
+                left.append(len(order))
+                order.append(node.left)
+            else:
+                left.append(-1)
+            if node.right is not None:
+                right.append(len(order))
+                order.append(node.right)
+            else:
+                right.append(-1)
+        vals = [node.value for node in order]
+        try:
+            vals = array('q', vals)
+        except (TypeError, OverflowError):
+            # float и целые вне 64 бит остаются в списке
+            pass
+        n = len(vals)
+
+        # Значения по умолчанию - это сводка листа
+        height = array('i', [1]) * n
+        sub_min = vals[:]
+        sub_max = vals[:]
+        flags = array('B', [_ALL]) * n
+        for i in range(n - 1, -1, -1):
+            l = left[i]
+            r = right[i]
+            if l < 0 and r < 0:
+                continue
+            val = vals[i]
+            f = _MIN | _MAX
+            l_h = r_h = 0
+            l_f = r_f = _ALL
+            if l >= 0:
+                l_h = height[l]
+                l_f = flags[l]
+                if vals[l] < val:
+                    f &= ~_MIN
+                elif vals[l] > val:
+                    f &= ~_MAX
+                if sub_min[l] < sub_min[i]:
+                    sub_min[i] = sub_min[l]
+                if sub_max[l] > sub_max[i]:
+                    sub_max[i] = sub_max[l]
+            if r >= 0:
+                r_h = height[r]
+                r_f = flags[r]
+                if vals[r] < val:
+                    f &= ~_MIN
+                elif vals[r] > val:
+                    f &= ~_MAX
+                if sub_min[r] < sub_min[i]:
+                    sub_min[i] = sub_min[r]
+                if sub_max[r] > sub_max[i]:
+                    sub_max[i] = sub_max[r]
+
+            both = l_f & r_f
+            f &= both
+            # Линейный список: у узла не более 1 ребенка
+            if l < 0 or r < 0:
+                f |= both & _LINEAR
+            if l_h == r_h:
+                if both & _PERFECT:
+                    f |= _COMPLETE | _PERFECT
+                elif l_f & _PERFECT and r_f & _COMPLETE:
+                    f |= _COMPLETE
+            elif l_h == r_h + 1 and l_f & _COMPLETE and r_f & _PERFECT:
+                f |= _COMPLETE
+            height[i] = (l_h if l_h > r_h else r_h) + 1
+            flags[i] = f
+        return height[0], sub_min[0], sub_max[0], flags[0]
+
+    @staticmethod
+    def check_properties_recursive(root, c, d, A, B):
+        """
+        Прежняя рекурсивная версия (кортеж на узел) - для сравнения в
+        benchmark_analyzers.
         """
         # (height, is_linear, in_range, is_min, is_max, is_complete, is_perfect)
         res = TreeChecker._dfs(root, c, d)
@@ -112,4 +228,44 @@ def test():
     results = array('b', [res1[0], res1[1], res2[0], res2[1]])
     print("Результаты в array('b'):", results)
 
-test()
\ No newline at end of file
+test()
+
+def _complete_heap(n):
+    """Полная min-куча из n узлов (значения 0..n-1 по уровням)."""
+    nodes = [Node(i) for i in range(n)]
+    for i in range(n):
+        if 2 * i + 1 < n:
+            nodes[i].left = nodes[2 * i + 1]
+        if 2 * i + 2 < n:
+            nodes[i].right = nodes[2 * i + 2]
+    return nodes[0]
+
+def benchmark_analyzers(n=200000):
+    """
+    Время рекурсивной (кортеж на узел) и массивной версий на полной куче
+    из n узлов - проверка идет до корня - и линия глубже лимита рекурсии.
+    """
+    print(f"\n--- Анализаторы свойств, N={n} ---")
+    root = _complete_heap(n)
+    for name, func in (("кортежи (рекурсия)", TreeChecker.check_properties_recursive),
+                       ("массивы", TreeChecker.check_properties)):
+        start = time.perf_counter()
+        result = func(root, 0, n, 0, 100)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<20} {result}: {elapsed:.4f} сек")
+
+    # Линия глубже лимита рекурсии (1000 по умолчанию)
+    chain = Node(0)
+    node = chain
+    for i in range(1, 10000):
+        node.right = Node(i)
+        node = node.right
+    try:
+        TreeChecker.check_properties_recursive(chain, 0, 10000, 0, 100)
+        print("Линия из 10000 узлов, рекурсия: ok")
+    except RecursionError:
+        print("Линия из 10000 узлов, рекурсия: RecursionError")
+    print(f"Линия из 10000 узлов, массивы: {TreeChecker.check_properties(chain, 0, 10000, 0, 100)}")
+
+if __name__ == '__main__':
+    benchmark_analyzers()
\ No newline at end of file
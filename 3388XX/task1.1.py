@@ -1,6 +1,7 @@
 import sys
 import time
 import random
+import heapq
 from array import array
 import matplotlib.pyplot as plt
 
@@ -64,6 +65,163 @@ class Tree:
         # Backtracking: удаляем последний элемент перед возвратом на уровень выше
         current_path.pop()
 
+    def find_min_max_paths_fused(self):
+        """
+        Тот же результат, что find_min_max_paths, за один итеративный обход,
+        но без копирования всего пути при каждом новом минимуме/максимуме.
+        valid_min/valid_max - длина общего префикса текущего пути и
+        сохраненного лучшего: при возврате вверх он только укорачивается,
+        а при улучшении дописывается лишь хвост после него. Каждый узел
+        пути копируется не больше одного раза на каждое свое появление в
+        пути, поэтому суммарно O(N), а памяти - O(H): текущий путь и два
+        лучших, без массивов на все узлы.
+        """
+        if not self.root:
+            return None
+
+        max_sum = -float('inf')
+        min_sum = float('inf')
+        max_path = array('i')
+        min_path = array('i')
+        valid_max = valid_min = 0
+
+        path = array('i')
+        # Отложенные правые дети: узел, его глубина и сумма пути до него
+        stack = []
+        stack_depth = array('i')
+        stack_sum = array('q')
+        node = self.root
+        depth = 0
+        current_sum = 0
+        while True:
+            val = node.value
+            current_sum += val
+            path.append(val)
+            left = node.left
+            right = node.right
+
+            if left is None and right is None:
+                # Строгие сравнения: при равенстве остается левый лист
+                if current_sum > max_sum:
+                    max_sum = current_sum
+                    del max_path[valid_max:]
+                    max_path.extend(path[valid_max:])
+                    valid_max = len(path)
+                if current_sum < min_sum:
+                    min_sum = current_sum
+                    del min_path[valid_min:]
+                    min_path.extend(path[valid_min:])
+                    valid_min = len(path)
+                if not stack:
+                    break
+                # Возврат к отложенному правому ребенку: путь и общие
+                # префиксы с лучшими путями укорачиваются до его глубины
+                node = stack.pop()
+                depth = stack_depth.pop()
+                current_sum = stack_sum.pop()
+                del path[depth:]
+                if valid_max > depth:
+                    valid_max = depth
+                if valid_min > depth:
+                    valid_min = depth
+                continue
+
+            # Спуск без стека: сначала левый ребенок, правый - в отложенные
+            depth += 1
+            if left is not None:
+                if right is not None:
+                    stack.append(right)
+                    stack_depth.append(depth)
+                    stack_sum.append(current_sum)
+                node = left
+            else:
+                node = right
+
+        self.max_sum = max_sum
+        self.min_sum = min_sum
+        self.max_path = max_path
+        self.min_path = min_path
+        return self.min_path, self.max_path
+
+    def find_k_min_max_paths(self, k):
+        """
+        k путей с наименьшей и k путей с наибольшей суммой за один обход.
+        Кандидаты держатся в двух кучах размера k (heapq требует list),
+        пути восстанавливаются только для победителей.
+        Возвращает (smallest, largest) - списки пар (сумма, путь),
+        отсортированные от лучшего к худшему; при равных суммах раньше
+        идет левый лист.
+        """
+        if not self.root or k <= 0:
+            return [], []
+
+        vals, parent, leaves, sums = self._index_leaves()
+        # Корень кучи - худший из отобранных: для наибольших это минимальная
+        # пара (сумма, -лист), для наименьших - максимальная (сумма, лист)
+        largest = []
+        smallest = []
+        for pos in range(len(leaves)):
+            s = sums[pos]
+            leaf = leaves[pos]
+            if len(largest) < k:
+                heapq.heappush(largest, (s, -leaf))
+            elif (s, -leaf) > largest[0]:
+                heapq.heapreplace(largest, (s, -leaf))
+            if len(smallest) < k:
+                heapq.heappush(smallest, (-s, -leaf))
+            elif (-s, -leaf) > smallest[0]:
+                heapq.heapreplace(smallest, (-s, -leaf))
+
+        largest.sort(reverse=True)
+        smallest.sort(reverse=True)
+        return ([(-s, self._restore_path(vals, parent, -leaf)) for s, leaf in smallest],
+                [(s, self._restore_path(vals, parent, -leaf)) for s, leaf in largest])
+
+    def _index_leaves(self):
+        """
+        Итеративный обход слева направо: нумерует узлы, запоминает значения и
+        родителей, а для листьев - номер и сумму пути.
+        Возвращает (vals, parent, leaves, sums).
+        """
+        vals = array('i')
+        parent = array('i')
+        leaves = array('i')
+        sums = array('q')
+
+        stack = [self.root]
+        stack_parent = array('i', (-1,))
+        stack_sum = array('q', (0,))
+        while stack:
+            node = stack.pop()
+            idx = len(vals)
+            vals.append(node.value)
+            parent.append(stack_parent.pop())
+            current_sum = stack_sum.pop() + node.value
+
+            if node.left is None and node.right is None:
+                leaves.append(idx)
+                sums.append(current_sum)
+                continue
+            # Правого кладем первым, чтобы левый обрабатывался раньше
+            if node.right:
+                stack.append(node.right)
+                stack_parent.append(idx)
+                stack_sum.append(current_sum)
+            if node.left:
+                stack.append(node.left)
+                stack_parent.append(idx)
+                stack_sum.append(current_sum)
+        return vals, parent, leaves, sums
+
+    @staticmethod
+    def _restore_path(vals, parent, leaf):
+        path = array('i')
+        while leaf != -1:
+            path.append(vals[leaf])
+            leaf = parent[leaf]
+        path.reverse()
+        return path
+
 def build_random_tree(n):
     """Вспомогательная функция для генерации дерева заданной сложности"""
     if n <= 0:
@@ -116,6 +274,36 @@ def benchmark():
     plt.grid(True)
     plt.show()
 
+def build_caterpillar_tree(m):
+    """
+    "Гусеница": правая цепочка из m узлов, у каждого - левый лист.
+    Значения положительные, поэтому при обходе слева направо максимальная
+    сумма улучшается на каждом листе, а путь к нему растет - худший случай
+    для копирования пути при каждом улучшении.
+    """
+    root = Node(1)
+    curr = root
+    for _ in range(m - 1):
+        curr.left = Node(1)
+        curr.right = Node(1)
+        curr = curr.right
+    return Tree(root)
+
+def benchmark_fused():
+    print(f"{'Spine':<10} | {'Copy (sec)':<12} | {'Fused (sec)':<12}")
+    print("-" * 40)
+    for m in (2000, 4000, 8000, 16000):
+        tree = build_caterpillar_tree(m)
+
+        start = time.perf_counter()
+        expected = tree.find_min_max_paths()
+        mid = time.perf_counter()
+        got = tree.find_min_max_paths_fused()
+        end = time.perf_counter()
+
+        assert got == expected
+        print(f"{m:<10} | {mid - start:<12.6f} | {end - mid:<12.6f}")
+
 if __name__ == "__main__":
     # 1. Простая проверка
     root = Node(10)
@@ -129,6 +317,13 @@ if __name__ == "__main__":
     print("Пример работы:")
     print(f"Путь с мин. суммой ({t.min_sum}): {min_p.tolist()}")
     print(f"Путь с макс. суммой ({t.max_sum}): {max_p.tolist()}\n")
+
+    smallest, largest = t.find_k_min_max_paths(2)
+    print("Два пути с мин. суммой:", [(s, p.tolist()) for s, p in smallest])
+    print("Два пути с макс. суммой:", [(s, p.tolist()) for s, p in largest], "\n")
+
+    benchmark_fused()
+    print()
     
     # 2. Бенчмарк
     benchmark()
\ No newline at end of file
@@ -17,13 +17,16 @@ class Tree:
     def __init__(self, root=None):
         self.root = root
 
-    def validate_heap(self, A, B):
+    def validate_heap(self, A, B, mode='dfs'):
         """
         Проверяет, является ли дерево кучей в диапазоне высот (A, B) за один проход.
         Возвращает (is_heap, type, height)
+        mode='bfs' - обход по уровням без позиционных индексов (см. _validate_bfs)
         """
         if not self.root:
             return (False, None, 0)
+        if mode == 'bfs':
+            return self._validate_bfs(A, B)
 
         # Состояние для прохода
         self._count = 0
@@ -54,6 +57,46 @@ class Tree:
             
         return is_heap, heap_type, self._max_depth
 
+    def _validate_bfs(self, A, B):
+        """
+        Обход по уровням: дерево полное, если после первого пустого места
+        (в порядке уровней слева направо) больше нет узлов. Позиционные
+        индексы 2*index+1 не нужны - на вырожденном дереве они становятся
+        длинными целыми и делают каждый шаг O(глубины).
+        Обход прерывается, как только ответ известен: узел после пустого
+        места, нарушены оба порядка или уровней уже не меньше B. В этом
+        случае height - число уровней, просмотренных до остановки.
+        """
+        level = [self.root]
+        height = 0
+        gap = False
+        min_ok = max_ok = True
+        while level:
+            height += 1
+            if height >= B:
+                return (False, None, height)
+            next_level = []
+            for node in level:
+                value = node.value
+                for child in (node.left, node.right):
+                    if child is None:
+                        gap = True
+                        continue
+                    if gap:
+                        return (False, None, height)
+                    if child.value < value:
+                        min_ok = False
+                    elif child.value > value:
+                        max_ok = False
+                    if not (min_ok or max_ok):
+                        return (False, None, height)
+                    next_level.append(child)
+            level = next_level
+
+        if not A < height:
+            return (False, None, height)
+        return (True, "Min-Heap" if min_ok else "Max-Heap", height)
+
     def _dfs(self, node, index, depth):
         self._count += 1
         if index > self._max_index:
@@ -95,6 +138,30 @@ def build_complete_tree(n, is_max_heap=True):
             nodes[i].right = nodes[right_idx]
     return nodes[0]
 
+def build_chain(n):
+    """Вырожденное дерево: цепочка левых детей с убывающими значениями"""
+    root = Node(n)
+    node = root
+    for v in range(n - 1, 0, -1):
+        node.left = Node(v)
+        node = node.left
+    return root
+
+def benchmark_degenerate():
+    """Регрессия на вырожденных деревьях: DFS с индексами против BFS"""
+    print(f"{'Depth':<10} | {'DFS (sec)':<12} | {'BFS (sec)':<12} | {'Same?':<6}")
+    print("-" * 50)
+    for n in (1000, 2000, 4000, 8000):
+        tree = Tree(build_chain(n))
+
+        start = time.perf_counter()
+        res_dfs = tree.validate_heap(0, 2 * n)
+        mid = time.perf_counter()
+        res_bfs = tree.validate_heap(0, 2 * n, mode='bfs')
+        end = time.perf_counter()
+
+        print(f"{n:<10} | {mid - start:<12.6f} | {end - mid:<12.6f} | {res_dfs[:2] == res_bfs[:2]}")
+
 # --- Анализ сложности ---
 
 def benchmark():
@@ -145,5 +212,11 @@ if __name__ == "__main__":
     is_h2, _, _ = t2.validate_heap(0, 10)
     print(f"Результат теста 2 (неполное): {is_h2}")
 
+    print(f"Тест 1 в режиме bfs: {t.validate_heap(1, 5, mode='bfs')}")
+    print(f"Тест 2 в режиме bfs: {t2.validate_heap(0, 10, mode='bfs')[0]}")
+
+    print("\n--- Вырожденные деревья ---")
+    benchmark_degenerate()
+
     # Запуск бенчмарка
     benchmark()
\ No newline at end of file
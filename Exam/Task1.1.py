@@ -12,10 +12,62 @@ class Node:
         self.value = value
         self.left = None
         self.right = None
+        # Метаданные поддерева: высота (кол-во узлов, как в
+        # check_tree_properties) и количество узлов
+        self.height = 1
+        self.size = 1
+
+def _height(node):
+    return node.height if node else 0
+
+def _size(node):
+    return node.size if node else 0
+
+def _update(node):
+    node.height = max(_height(node.left), _height(node.right)) + 1
+    node.size = _size(node.left) + _size(node.right) + 1
+
+def _rotate_right(node):
+    top = node.left
+    node.left = top.right
+    top.right = node
+    _update(node)
+    _update(top)
+    return top
+
+def _rotate_left(node):
+    top = node.right
+    node.right = top.left
+    top.left = node
+    _update(node)
+    _update(top)
+    return top
+
+def _rebalance(node):
+    """Пересчет метаданных и, при перекосе больше 1, АВЛ-поворот. Возвращает новый корень поддерева."""
+    _update(node)
+    balance = _height(node.left) - _height(node.right)
+    if balance > 1:
+        if _height(node.left.left) < _height(node.left.right):
+            node.left = _rotate_left(node.left)
+        return _rotate_right(node)
+    if balance < -1:
+        if _height(node.right.right) < _height(node.right.left):
+            node.right = _rotate_right(node.right)
+        return _rotate_left(node)
+    return node
 
 class Tree:
-    def __init__(self):
+    def __init__(self, balanced=False):
+        """
+        balanced=True включает режим АВЛ: после вставки и удаления дерево
+        балансируется поворотами, высота остается O(log N) на любой
+        последовательности ключей. Повороты могут перенести равный ключ в
+        левое поддерево, поэтому в этом режиме гарантируется только
+        неубывание значений в симметричном порядке.
+        """
         self.root = None
+        self.balanced = balanced
 
     def insert(self, value):
         """Вставка элемента в дерево (вариант BST для удобства построения)"""
@@ -23,8 +75,11 @@ class Tree:
             self.root = Node(value)
             return
         
+        path = []
         current = self.root
         while True:
+            path.append(current)
+            current.size += 1
             if value < current.value:
                 if current.left is None:
                     current.left = Node(value)
@@ -35,6 +90,204 @@ class Tree:
                     current.right = Node(value)
                     break
                 current = current.right
+        if self.balanced:
+            self._fix_path(path)
+            return
+        # Без балансировки размеры уже увеличены при спуске, а высота растет
+        # снизу вверх только пока новый лист удлиняет самый длинный путь
+        height = 2
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            if node.height >= height:
+                break
+            node.height = height
+            height += 1
+
+    def delete(self, value):
+        """Удаляет один узел со значением value. Возвращает True, если он был."""
+        path = []
+        node = self.root
+        while node is not None and node.value != value:
+            path.append(node)
+            node = node.left if value < node.value else node.right
+        if node is None:
+            return False
+
+        if node.left is not None and node.right is not None:
+            # Два ребенка: значение заменяется следующим по порядку,
+            # удаляется узел-преемник (у него нет левого ребенка)
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            node.value = successor.value
+            node = successor
+
+        child = node.left if node.left is not None else node.right
+        if not path:
+            self.root = child
+        elif path[-1].left is node:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        self._fix_path(path)
+        return True
+
+    # --- Порядковые статистики по размерам поддеревьев, O(высоты) ---
+
+    def select(self, k):
+        """k-е по возрастанию значение (k с 1)."""
+        if not 1 <= k <= _size(self.root):
+            raise IndexError("k вне диапазона [1, размер дерева]")
+        node = self.root
+        while True:
+            left_size = _size(node.left)
+            if k <= left_size:
+                node = node.left
+            elif k == left_size + 1:
+                return node.value
+            else:
+                k -= left_size + 1
+                node = node.right
+
+    def _count_less(self, x, inclusive=False):
+        # Количество значений < x (или <= x); опирается только на
+        # неубывание в симметричном порядке, поэтому верно и в режиме АВЛ
+        count = 0
+        node = self.root
+        while node is not None:
+            if node.value < x or (inclusive and node.value == x):
+                count += _size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def rank(self, x):
+        """Количество значений строго меньше x (позиция x среди отсортированных с 0)."""
+        return self._count_less(x)
+
+    def count_range(self, lo, hi):
+        """Количество значений в [lo, hi]."""
+        if lo > hi:
+            return 0
+        return self._count_less(hi, inclusive=True) - self._count_less(lo)
+
+    def _fix_path(self, path):
+        """Снизу вверх по пути изменения: пересчет высоты/размера и, в режиме АВЛ, повороты."""
+        if not self.balanced:
+            for node in reversed(path):
+                _update(node)
+            return
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            top = _rebalance(node)
+            if top is node:
+                continue
+            if i == 0:
+                self.root = top
+            elif path[i - 1].left is node:
+                path[i - 1].left = top
+            else:
+                path[i - 1].right = top
+
+    def bulk_load(self, values):
+        """
+        Загрузка набора значений одним действием: значения сортируются один
+        раз, и по отсортированному массиву за O(N) строится сбалансированное
+        по высоте дерево поиска (вместо N вызовов insert, которые на
+        отсортированных данных вырождают дерево в линию). Старое
+        содержимое дерева заменяется. Равные ключи могут оказаться по обе
+        стороны от узла, как в режиме АВЛ.
+        """
+        self.root = _build_balanced(sorted(values))
+
+    def merge_sorted(self, values):
+        """
+        Добавляет в дерево отсортированную пачку значений за O(N + K):
+        дерево выписывается в симметричном порядке, сливается с пачкой
+        и строится заново сбалансированным.
+        """
+        batch = list(values)
+        current = _in_order(self.root)
+        merged = [None] * (len(current) + len(batch))
+        i = j = k = 0
+        while i < len(current) and j < len(batch):
+            # При равенстве первым идет старое значение, как при вставке вправо
+            if batch[j] < current[i]:
+                merged[k] = batch[j]
+                j += 1
+            else:
+                merged[k] = current[i]
+                i += 1
+            k += 1
+        merged[k:] = current[i:] + batch[j:]
+        self.root = _build_balanced(merged)
+
+
+def _in_order(root):
+    """
+    Значения дерева в симметричном (отсортированном) порядке, без рекурсии.
+    list, а не array: ключи - любые сравнимые значения, как в insert.
+    """
+    result = []
+    stack = []
+    node = root
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        result.append(node.value)
+        node = node.right
+    return result
+
+
+def _build_balanced(values):
+    """
+    Сбалансированное дерево поиска из отсортированного массива, итеративно.
+    Корень отрезка - его середина, поэтому высота - ceil(log2(N + 1)) и при
+    повторяющихся ключах: равные середине значения остаются с обеих сторон
+    (симметричный порядок - неубывающий, как в режиме АВЛ).
+    """
+    if not len(values):
+        return None
+    root = None
+    created = []
+    # Стек отрезков [lo, hi] и узел, к которому подвешивается корень отрезка
+    bounds = array('l', (0, len(values) - 1))
+    parents = [None]
+    sides = array('b', (0,))
+    while parents:
+        hi = bounds.pop()
+        lo = bounds.pop()
+        parent = parents.pop()
+        is_right = sides.pop()
+        mid = (lo + hi) // 2
+        node = Node(values[mid])
+        created.append(node)
+        if parent is None:
+            root = node
+        elif is_right:
+            parent.right = node
+        else:
+            parent.left = node
+        if mid < hi:
+            bounds.append(mid + 1)
+            bounds.append(hi)
+            parents.append(node)
+            sides.append(1)
+        if lo < mid:
+            bounds.append(lo)
+            bounds.append(mid - 1)
+            parents.append(node)
+            sides.append(0)
+    # Дети создаются после родителей - в обратном порядке метаданные
+    # считаются снизу вверх
+    for node in reversed(created):
+        _update(node)
+    return root
 
 def get_paths_outside_range(tree, a, b):
     """
@@ -82,14 +335,130 @@ def get_paths_outside_range(tree, a, b):
 
 # --- Вспомогательные функции для тестов и замеров ---
 
-def generate_random_tree(size):
+def generate_random_tree(size, bulk=False):
     t = Tree()
     # Используем array для генерации значений, чтобы не нарушать условие "без list" даже в тесте
     values = array('i', (random.randint(0, 100000) for _ in range(size)))
+    if bulk:
+        t.bulk_load(values)
+        return t
     for v in values:
         t.insert(v)
     return t
 
+def tree_height(tree):
+    """Высота дерева (кол-во узлов на самом длинном пути), без рекурсии."""
+    height = 0
+    stack = [(tree.root, 1)] if tree.root else []
+    while stack:
+        node, depth = stack.pop()
+        height = max(height, depth)
+        for child in (node.left, node.right):
+            if child:
+                stack.append((child, depth + 1))
+    return height
+
+def check_avl(tree, A, B):
+    """
+    Проверка "АВЛ-дерево с высотой строго между A и B" (как в
+    example/task2.1.py::check_tree_properties) по сохраненным метаданным:
+    высоты детей уже известны, поэтому узлы можно обходить в любом порядке,
+    без рекурсии и без возврата кортежей снизу вверх. Заодно проверяется,
+    что метаданные согласованы с детьми. Порядок значений - неубывающий
+    (равные ключи допустимы с обеих сторон).
+    """
+    if tree.root is None:
+        return A < 0 < B
+    stack = [tree.root]
+    while stack:
+        node = stack.pop()
+        l_h = _height(node.left)
+        r_h = _height(node.right)
+        if node.height != max(l_h, r_h) + 1 or abs(l_h - r_h) > 1:
+            return False
+        if node.size != _size(node.left) + _size(node.right) + 1:
+            return False
+        if node.left:
+            stack.append(node.left)
+        if node.right:
+            stack.append(node.right)
+    values = _in_order(tree.root)
+    for i in range(1, len(values)):
+        if values[i - 1] > values[i]:
+            return False
+    return A < tree.root.height < B
+
+def benchmark_balanced(sizes=(1000, 2000, 4000)):
+    """Вставка и поиск путей: обычный и АВЛ-режим на возрастающих и случайных ключах."""
+    print(f"{'N':>6} {'ключи':>12} {'режим':>8} {'вставка, сек':>13} "
+          f"{'пути, сек':>10} {'высота':>7}")
+    for n in sizes:
+        random_keys = array('i', (random.randint(0, 100000) for _ in range(n)))
+        for name, keys in (("возрастающие", array('i', range(n))), ("случайные", random_keys)):
+            for balanced in (False, True):
+                t = Tree(balanced=balanced)
+                start = time.perf_counter()
+                for v in keys:
+                    t.insert(v)
+                insert_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                get_paths_outside_range(t, 10, 20)
+                query_time = time.perf_counter() - start
+                mode = "АВЛ" if balanced else "обычный"
+                print(f"{n:>6} {name:>12} {mode:>8} {insert_time:>13.4f} "
+                      f"{query_time:>10.4f} {t.root.height:>7}")
+
+def benchmark_order_statistics(n=100000, queries=1000):
+    """select/rank/count_range против полного обхода на каждый запрос."""
+    t = Tree(balanced=True)
+    t.bulk_load(array('i', (random.randint(0, 100000) for _ in range(n))))
+    windows = [(lo, lo + random.randint(0, 1000))
+               for lo in (random.randint(0, 100000) for _ in range(queries))]
+
+    # Базовый вариант: на каждый запрос - обход всего дерева
+    scan_queries = max(1, queries // 100)
+    start = time.perf_counter()
+    expected = []
+    for lo, hi in windows[:scan_queries]:
+        values = _in_order(t.root)
+        expected.append(sum(1 for v in values if lo <= v <= hi))
+    scan_time = (time.perf_counter() - start) / scan_queries
+
+    start = time.perf_counter()
+    counts = [t.count_range(lo, hi) for lo, hi in windows]
+    fast_time = (time.perf_counter() - start) / queries
+
+    median = t.select((n + 1) // 2)
+    print(f"N={n}, медиана {median}, rank(медианы) = {t.rank(median)}")
+    print(f"count_range совпадает с обходом: {counts[:scan_queries] == expected}")
+    print(f"Полный обход: {scan_time * 1e6:.1f} мкс/запрос, "
+          f"count_range: {fast_time * 1e6:.1f} мкс/запрос")
+
+def compare_sorted_loading(n=5000):
+    """Отсортированный поток ключей: поштучный insert против bulk_load."""
+    keys = array('i', range(n))
+
+    start = time.perf_counter()
+    t_insert = Tree()
+    for v in keys:
+        t_insert.insert(v)
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    t_bulk = Tree()
+    t_bulk.bulk_load(keys)
+    bulk_time = time.perf_counter() - start
+
+    print(f"N={n}, ключи по возрастанию:")
+    print(f"  insert:    {insert_time:.4f} сек, высота {tree_height(t_insert)}")
+    print(f"  bulk_load: {bulk_time:.4f} сек, высота {tree_height(t_bulk)}")
+
+    start = time.perf_counter()
+    t_bulk.merge_sorted(range(n, 2 * n))
+    print(f"  merge_sorted еще {n}: {time.perf_counter() - start:.4f} сек, "
+          f"высота {tree_height(t_bulk)}")
+
 def benchmark():
     sizes = array('i', range(100, 10100, 500)) # 100, 600, 1100...
     times = array('d') # Double precision float
@@ -149,6 +518,15 @@ def print_example():
 # Запуск
 if __name__ == "__main__":
     print_example()
+
+    print("\n--- Загрузка отсортированных ключей ---")
+    compare_sorted_loading()
+
+    print("\n--- Обычный и АВЛ-режим вставки ---")
+    benchmark_balanced()
+
+    print("\n--- Порядковые статистики ---")
+    benchmark_order_statistics()
     
     print("\n--- Запуск тестов производительности ---")
     sizes, measured_times = benchmark()
@@ -0,0 +1,204 @@
+import os
+import time
+from multiprocessing import Pool
+
+from compact_tree import CompactTree
+from tree_io import dumps_tree, loads_tree, read_header
+from validator import (BST, MIN_HEAP, MAX_HEAP, LINEAR, RANGE, HEIGHT, INF,
+                       validate_compact)
+
+# Узлов в одной пачке задач: мелкие деревья едут в процесс пачкой (одна
+# пересылка вместо сотни), большое дерево - отдельной пачкой
+CHUNK_NODES = 20000
+
+
+# ==========================================
+# 1. Проверки (семантика исходных заданий на CompactTree)
+# ==========================================
+
+def check_properties(ct, c, d, A, B):
+    """
+    TreeChecker.check_properties из 338825/task2.1: (is_linear_list, is_heap).
+    Линейный список в [c, d] - это LINEAR | RANGE, куча - полное дерево с
+    порядком кучи (validate требует полноту для MIN_HEAP/MAX_HEAP) и
+    высотой (кол-во узлов) строго в (A, B).
+    """
+    mask = validate_compact(ct, LINEAR | RANGE | MIN_HEAP | MAX_HEAP | HEIGHT,
+                            value_range=(c, d), height_window=(A, B))
+    return (mask & (LINEAR | RANGE) == LINEAR | RANGE,
+            bool(mask & (MIN_HEAP | MAX_HEAP)) and bool(mask & HEIGHT))
+
+
+def is_bst_and_taller_than_n(ct, n):
+    """
+    is_bst_and_taller_than_n из 338818/task2.2: строгое BST и высота в
+    ребрах больше n. В узлах это высота > n + 1; у пустого дерева высота
+    -1 ребро, и окно (n + 1, inf) дает тот же ответ.
+    """
+    mask = validate_compact(ct, BST | HEIGHT, height_window=(n + 1, INF))
+    return mask == BST | HEIGHT
+
+
+# ==========================================
+# 2. Пачки задач и пул процессов
+# ==========================================
+
+def _chunks(blobs, chunk_nodes):
+    """
+    Режет поток (индекс, байты дерева) на пачки примерно по chunk_nodes
+    узлов. Генератор: пул забирает пачки в своем потоке, поэтому
+    процессы начинают проверку, пока главный процесс еще сериализует.
+    """
+    chunk = []
+    nodes = 0
+    for idx, blob in blobs:
+        chunk.append((idx, blob))
+        nodes += read_header(blob)[1]
+        if nodes >= chunk_nodes:
+            yield chunk
+            chunk = []
+            nodes = 0
+    if chunk:
+        yield chunk
+
+
+def _check_chunk(kernel, args, chunk):
+    """Проверка пачки в процессе пула: (pid, [(индекс, результат)], узлов, сек)."""
+    start = time.perf_counter()
+    results = []
+    nodes = 0
+    for idx, blob in chunk:
+        ct = loads_tree(blob)
+        nodes += len(ct)
+        results.append((idx, kernel(ct, *args)))
+    return os.getpid(), results, nodes, time.perf_counter() - start
+
+
+def _serialize(trees):
+    for idx, tree in enumerate(trees):
+        yield idx, tree if isinstance(tree, (bytes, bytearray)) else dumps_tree(tree, None)
+
+
+def validate_batch(trees, kernel=check_properties, args=(), workers=None,
+                   chunk_nodes=CHUNK_NODES):
+    """
+    Проверяет много независимых деревьев функцией kernel(ct, *args) и
+    возвращает (результаты в порядке trees, статистика процессов).
+
+    Деревья (Tree/Node/CompactTree или уже готовые байты dumps_tree)
+    пересылаются в формате tree_io - 2 бита структуры и значение на узел,
+    а не pickle графа Node (десятки байт на объект и рекурсия pickle на
+    глубоких деревьях). Пачки раздаются через imap_unordered по одной:
+    освободившийся процесс сам забирает следующую, поэтому крупные
+    деревья не задерживают остальных; порядок восстанавливается по
+    индексам. kernel должен быть функцией уровня модуля (pickle по имени).
+
+    Статистика: {pid: [пачек, деревьев, узлов, секунд проверки]}.
+    """
+    trees = list(trees)
+    results = [None] * len(trees)
+    stats = {}
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        # Один процесс: деревья проверяются на месте, без сериализации
+        start = time.perf_counter()
+        nodes = 0
+        for idx, tree in enumerate(trees):
+            ct = _as_compact(tree)
+            nodes += len(ct)
+            results[idx] = kernel(ct, *args)
+        stats[os.getpid()] = [1, len(trees), nodes, time.perf_counter() - start]
+        return results, stats
+
+    chunks = _chunks(_serialize(trees), chunk_nodes)
+    with Pool(workers) as pool:
+        parts = pool.imap_unordered(_run_chunk, ((kernel, args, chunk) for chunk in chunks))
+        _collect(parts, results, stats)
+    return results, stats
+
+
+def _as_compact(tree):
+    if isinstance(tree, CompactTree):
+        return tree
+    if isinstance(tree, (bytes, bytearray)):
+        return loads_tree(tree)
+    # typecode по значениям: float и целые вне 32 бит тоже проходят
+    return CompactTree.from_tree(tree, None)
+
+
+def _run_chunk(task):
+    return _check_chunk(*task)
+
+
+def _collect(parts, results, stats):
+    for pid, part, nodes, elapsed in parts:
+        row = stats.setdefault(pid, [0, 0, 0, 0.0])
+        row[0] += 1
+        row[1] += len(part)
+        row[2] += nodes
+        row[3] += elapsed
+        for idx, result in part:
+            results[idx] = result
+
+
+def report(stats, wall):
+    """Пропускная способность по процессам и итог за wall секунд."""
+    lines = []
+    for pid, (chunks, count, nodes, busy) in sorted(stats.items()):
+        rate = nodes / busy if busy else 0
+        lines.append(f"    pid {pid}: пачек {chunks}, деревьев {count}, узлов {nodes}, "
+                     f"занят {busy:.3f} сек ({rate / 1e6:.2f} млн узлов/сек)")
+    nodes = sum(row[2] for row in stats.values())
+    lines.append(f"    всего {nodes} узлов за {wall:.3f} сек "
+                 f"({nodes / wall / 1e6:.2f} млн узлов/сек)")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import pickle
+    import random
+    from tree_builders import SHAPES, build_tree
+
+    rng = random.Random(1)
+    trees = []
+    for t in range(300):
+        # Размеры с тяжелым хвостом: пара больших деревьев среди мелких
+        n = int(rng.paretovariate(1.2) * 200)
+        shape = rng.choice(SHAPES)
+        if shape in ('complete', 'bst'):
+            trees.append(build_tree(n, shape, values=range(n), compact=True))
+        else:
+            trees.append(build_tree(n, shape, seed=t, compact=True))
+    total = sum(len(ct) for ct in trees)
+    print(f"Деревьев: {len(trees)}, узлов: {total}, самое большое: {max(map(len, trees))}")
+
+    # Значения, которые не помещаются в array('i'): float и целые от 2**31
+    from bin_tree import Node
+    float_tree = Node(1.5)
+    float_tree.left = Node(0.5)
+    big_tree = Node(2**31)
+    big_tree.left = Node(2**31 + 1)
+    odd = [float_tree, big_tree]
+    odd_args = (0, 2**32, 0, 5)
+    for w in (1, 2):
+        odd_results, _ = validate_batch(odd, check_properties, odd_args, workers=w)
+        assert odd_results == [(True, True), (True, True)], odd_results
+    print("float и целые вне 32 бит: ok")
+
+    sample = build_tree(2000, 'balanced', seed=1)
+    print(f"Пересылка дерева из 2000 узлов: tree_io {len(dumps_tree(sample))} байт, "
+          f"pickle графа Node {len(pickle.dumps(sample.root))} байт")
+
+    workers = max(2, os.cpu_count() or 1)
+    for title, kernel, args in (("check_properties (338825)", check_properties, (-100, total, 0, 30)),
+                                ("is_bst_and_taller_than_n (338818)", is_bst_and_taller_than_n, (5,))):
+        start = time.perf_counter()
+        expected, _ = validate_batch(trees, kernel, args, workers=1)
+        seq_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        got, stats = validate_batch(trees, kernel, args, workers=workers)
+        wall = time.perf_counter() - start
+        print(f"\n{title}: совпадает {got == expected}, 1 процесс {seq_time:.3f} сек, "
+              f"пул из {workers} процессов {wall:.3f} сек (процессоров: {os.cpu_count()})")
+        print(report(stats, wall))
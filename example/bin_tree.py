@@ -1,10 +1,10 @@
-import sys
 import time
 import random
 from array import array
 
-# Увеличим лимит рекурсии для глубоких деревьев (вырожденных в линию)
-sys.setrecursionlimit(50000)
+from lazy_paths import LazyPaths, NIL
+from leaf_index import LeafIndex
+from path_stream import iter_paths
 
 class Node:
     __slots__ = ('val', 'left', 'right')
@@ -17,9 +17,23 @@ class Node:
 class Tree:
     def __init__(self):
         self.root = None
+        # Необязательный индекс листьев (см. enable_leaf_index)
+        self.leaf_index = None
+
+    def enable_leaf_index(self):
+        """
+        Строит LeafIndex по текущему дереву; дальше insert_random обновляет
+        его инкрементально, и запросы "сколько/какие листья с глубиной или
+        суммой пути в [a, b]" не требуют обхода дерева.
+        """
+        self.leaf_index = LeafIndex.from_tree(self)
+        return self.leaf_index
 
     def insert_random(self, val):
         """Вспомогательная функция для создания случайного дерева."""
+        if self.leaf_index is not None:
+            self._insert_random_indexed(val)
+            return
         if self.root is None:
             self.root = Node(val)
             return
@@ -38,48 +52,120 @@ class Tree:
                     break
                 curr = curr.right
 
+    def _insert_random_indexed(self, val):
+        """insert_random с обновлением индекса листьев."""
+        index = self.leaf_index
+        if self.root is None:
+            self.root = Node(val)
+            index.add_leaf(self.root, 0, val)
+            return
+
+        curr = self.root
+        # Глубина и сумма пути до curr
+        depth = 0
+        path_sum = curr.val
+        while True:
+            if random.random() < 0.5:
+                if curr.left is None:
+                    curr.left = Node(val)
+                    index.on_insert(curr, depth, path_sum, curr.left)
+                    break
+                curr = curr.left
+            else:
+                if curr.right is None:
+                    curr.right = Node(val)
+                    index.on_insert(curr, depth, path_sum, curr.right)
+                    break
+                curr = curr.right
+            depth += 1
+            path_sum += curr.val
+
 def find_paths_in_range(tree, a, b):
     """
     Находит все пути от корня до листа длиной (кол-во ребер) от a до b.
     Возвращает array('i'), содержащий найденные пути в формате:
     [len_path1, node_val1, node_val2..., len_path2, node_val1...]
+
+    Обход - общий итеративный path_stream.iter_paths (явный стек вместо
+    рекурсии), поэтому глубина дерева не ограничена лимитом рекурсии
+    интерпретатора, а поддеревья глубже b не обходятся.
     """
     # Результирующий массив (плоский список всех путей)
     # Используем 'i' (signed int), предполагая, что значения узлов целые
     results = array('i')
-    
-    # Стек для хранения текущего пути
-    path_stack = array('i')
-    
-    if tree.root is None:
-        return results
-
-    def _dfs(node, current_length):
-        # Добавляем текущий узел в стек пути
-        path_stack.append(node.val)
-        
-        # Проверяем, является ли узел листом
-        if node.left is None and node.right is None:
-            # Проверяем условие диапазона длины (по количеству ребер)
-            if a <= current_length <= b:
-                # Сохраняем результат.
-                # Чтобы "разделить" пути в одном массиве, 
-                # сначала запишем длину пути (количество узлов = ребра + 1), затем сами узлы.
-                # Кол-во узлов = len(path_stack)
-                results.append(len(path_stack))
-                results.extend(path_stack)
-        else:
-            if node.left:
-                _dfs(node.left, current_length + 1)
-            if node.right:
-                _dfs(node.right, current_length + 1)
-        
-        # Backtracking: удаляем текущий узел из стека при возврате вверх
-        path_stack.pop()
-
-    _dfs(tree.root, 0)
+    for path in iter_paths(tree, a, b, typecode='i'):
+        # Чтобы "разделить" пути в одном массиве, сначала запишем длину
+        # пути (количество узлов = ребра + 1), затем сами узлы
+        results.append(len(path))
+        results.extend(path)
     return results
 
+def find_paths_lazy(tree, a, b):
+    """
+    То же, что find_paths_in_range, но пути не копируются: возвращает
+    LazyPaths с индексами подходящих листьев и массивом родителей.
+    Записываются только узлы, лежащие на пути к подходящему листу: предки
+    листа дописываются в момент, когда лист подошел, а общие с прежними
+    путями предки уже записаны. Память - узлы объединения найденных путей,
+    а не все посещенные узлы; пути восстанавливаются по требованию.
+    """
+    # Значения и родители записанных узлов
+    vals = array('i')
+    parent = array('i')
+    leaves = array('i')
+    if tree.root is None:
+        return LazyPaths(vals, parent, leaves)
+
+    # Текущий путь: значения и индексы в vals (NIL - узел еще не записан).
+    # Записанные узлы пути всегда образуют его начало
+    path_vals = array('i')
+    path_idx = array('i')
+    # Отложенные правые ветки: узел и глубина
+    pending = []
+    pending_depth = array('i')
+
+    node = tree.root
+    depth = 0
+    while True:
+        path_vals.append(node.val)
+        path_idx.append(NIL)
+        left = node.left
+        right = node.right
+
+        if left is None and right is None:
+            if a <= depth <= b:
+                # Последний записанный предок и дописывание остальных
+                k = depth
+                while k >= 0 and path_idx[k] == NIL:
+                    k -= 1
+                par = path_idx[k] if k >= 0 else NIL
+                for j in range(k + 1, depth + 1):
+                    path_idx[j] = len(vals)
+                    vals.append(path_vals[j])
+                    parent.append(par)
+                    par = path_idx[j]
+                leaves.append(par)
+        elif depth < b:
+            depth += 1
+            if left is not None:
+                if right is not None:
+                    pending.append(right)
+                    pending_depth.append(depth)
+                node = left
+            else:
+                node = right
+            continue
+
+        if not pending:
+            break
+        node = pending.pop()
+        depth = pending_depth.pop()
+        # Откат: в пути остаются только предки нового узла
+        del path_vals[depth:]
+        del path_idx[depth:]
+
+    return LazyPaths(vals, parent, leaves)
+
 # Вспомогательная функция для красивого вывода результатов из плоского array
 def print_results(results_array):
     if not results_array:
@@ -101,35 +187,49 @@ def print_results(results_array):
 
 # --- Проверка работы функции ---
 
-print("=== ТЕСТ 1: Ручная конфигурация ===")
-#      1
-#     / \
-#    2   3
-#   /     \
-#  4       5
-#           \
-#            6
-t = Tree()
-t.root = Node(1)
-t.root.left = Node(2)
-t.root.left.left = Node(4) # Лист, длина 2
-t.root.right = Node(3)
-t.root.right.right = Node(5)
-t.root.right.right.right = Node(6) # Лист, длина 3
-
-# Ищем пути длиной от 2 до 3
-print("Ищем пути длиной [2, 3]:")
-res = find_paths_in_range(t, 2, 3)
-print_results(res)
-
-print("\n=== ТЕСТ 2: Пустое дерево ===")
-t_empty = Tree()
-res_empty = find_paths_in_range(t_empty, 0, 10)
-print_results(res_empty)
-
-print("\n=== ТЕСТ 3: Один узел (длина 0) ===")
-t_single = Tree()
-t_single.root = Node(100)
-# Диапазон [0, 0] должен найти корень
-res_single = find_paths_in_range(t_single, 0, 0)
-print_results(res_single)
+if __name__ == "__main__":
+    print("=== ТЕСТ 1: Ручная конфигурация ===")
+    #      1
+    #     / \
+    #    2   3
+    #   /     \
+    #  4       5
+    #           \
+    #            6
+    t = Tree()
+    t.root = Node(1)
+    t.root.left = Node(2)
+    t.root.left.left = Node(4) # Лист, длина 2
+    t.root.right = Node(3)
+    t.root.right.right = Node(5)
+    t.root.right.right.right = Node(6) # Лист, длина 3
+
+    # Ищем пути длиной от 2 до 3
+    print("Ищем пути длиной [2, 3]:")
+    res = find_paths_in_range(t, 2, 3)
+    print_results(res)
+
+    print("\n=== ТЕСТ 2: Пустое дерево ===")
+    t_empty = Tree()
+    res_empty = find_paths_in_range(t_empty, 0, 10)
+    print_results(res_empty)
+
+    print("\n=== ТЕСТ 3: Один узел (длина 0) ===")
+    t_single = Tree()
+    t_single.root = Node(100)
+    # Диапазон [0, 0] должен найти корень
+    res_single = find_paths_in_range(t_single, 0, 0)
+    print_results(res_single)
+
+    print("\n=== ТЕСТ 4: Ленивый результат ===")
+    lazy = find_paths_lazy(t, 2, 3)
+    print(f"Найдено путей: {len(lazy)}, первый: {lazy[0].tolist()}")
+    print(f"Совпадает с плоским форматом: {lazy.flat() == find_paths_in_range(t, 2, 3)}")
+
+    print("\n=== ТЕСТ 5: Индекс листьев ===")
+    t_idx = Tree()
+    index = t_idx.enable_leaf_index()
+    for v in range(1000):
+        t_idx.insert_random(v)
+    count = index.count_by_depth(5, 8)
+    print(f"Листьев с длиной [5, 8]: {count}, совпадает с обходом: {count == len(find_paths_lazy(t_idx, 5, 8))}")
@@ -0,0 +1,450 @@
+import dis
+import sys
+import time
+from array import array
+
+# Индекс "нет узла" в массивах детей
+NIL = -1
+
+INF = float('inf')
+N_INF = float('-inf')
+
+# Флаги summarize - структурные свойства дерева (диапазон значений и
+# высота проверяются отдельно по min/max/height из той же сводки)
+BST = 1           # строгое дерево поиска
+AVL = 2           # BST + высоты детей отличаются не больше чем на 1
+LINEAR = 4        # у каждого узла не больше одного ребенка
+COMPLETE = 8      # полное дерево (структура кучи)
+PERFECT = 16      # все уровни заполнены целиком
+MIN_ORDERED = 32  # родитель <= детей (без требования полноты)
+MAX_ORDERED = 64  # родитель >= детей
+_ALL_FLAGS = BST | AVL | LINEAR | COMPLETE | PERFECT | MIN_ORDERED | MAX_ORDERED
+
+
+def _value_attr(node):
+    """В example узлы хранят значение в 'val', в остальных заданиях - в 'value'."""
+    return 'val' if hasattr(node, 'val') else 'value'
+
+
+def pick_typecode(values):
+    """
+    Typecode для значений: 'i' или 'q' для целых (самый узкий, в который
+    они помещаются), 'd' для чисел с плавающей точкой (и смеси с
+    целыми). Иначе TypeError.
+    """
+    types = set(map(type, values))
+    if types <= {int, bool}:
+        lo = min(values, default=0)
+        hi = max(values, default=0)
+        for typecode in ('i', 'q'):
+            bits = array(typecode).itemsize * 8 - 1
+            if -2**bits <= lo and hi < 2**bits:
+                return typecode
+    elif types <= {int, bool, float}:
+        return 'd'
+    raise TypeError("Значения узлов должны быть числами, представимыми в array")
+
+
+def buffer_typecode(buf):
+    """Typecode буфера значений: array или memoryview (например, из tree_io)."""
+    return buf.typecode if isinstance(buf, array) else buf.format
+
+
+class CompactTree:
+    """
+    Бинарное дерево в виде "структуры массивов".
+
+    Значение, индекс левого и индекс правого ребенка узла i лежат в
+    параллельных буферах vals[i], left[i], right[i]; отсутствующий ребенок -
+    NIL. Корень - узел 0. Инвариант: индекс ребенка всегда больше индекса
+    родителя (так нумеруют from_tree и add_node), поэтому проход по индексам
+    в обратном порядке обрабатывает детей раньше родителей - без рекурсии.
+
+    Узел занимает 12 байт (3 x 'i') вместо ~56-72 байт объекта Node,
+    а обходы читают подряд лежащие массивы вместо цепочки указателей.
+    """
+    __slots__ = ('vals', 'left', 'right')
+
+    def __init__(self, typecode='i'):
+        self.vals = array(typecode)
+        self.left = array('i')
+        self.right = array('i')
+
+    def __len__(self):
+        return len(self.vals)
+
+    @property
+    def typecode(self):
+        return buffer_typecode(self.vals)
+
+    @property
+    def root(self):
+        return 0 if len(self.vals) else NIL
+
+    def add_node(self, val, parent=NIL, is_left=True):
+        """Добавляет узел (ребенком parent, если он задан) и возвращает его индекс."""
+        idx = len(self.vals)
+        self.vals.append(val)
+        self.left.append(NIL)
+        self.right.append(NIL)
+        if parent != NIL:
+            if is_left:
+                self.left[parent] = idx
+            else:
+                self.right[parent] = idx
+        return idx
+
+    def nbytes(self):
+        """Объем буферов дерева в байтах."""
+        return (len(self.vals) * self.vals.itemsize +
+                len(self.left) * self.left.itemsize +
+                len(self.right) * self.right.itemsize)
+
+    @classmethod
+    def from_tree(cls, tree, typecode='i'):
+        """
+        Строит компактное дерево из Tree (или корневого Node) любого задания.
+        Узлы нумеруются в прямом порядке (preorder), обход итеративный.
+        typecode=None - выбрать по значениям (pick_typecode): так проходят
+        и float, и целые вне 'i'.
+        """
+        root = tree.root if hasattr(tree, 'root') else tree
+        ct = cls(typecode or 'q')
+        if root is None:
+            return ct
+
+        attr = _value_attr(root)
+        # Без typecode значения сначала собираются в list
+        vals = ct.vals if typecode else []
+        left = ct.left
+        right = ct.right
+
+        # В прямом порядке левый ребенок всегда получает индекс idx + 1,
+        # поэтому в стек кладутся только правые дети вместе с индексом
+        # родителя, которому нужно дописать right
+        pending = []
+        pending_parent = array('l')
+        node = root
+        while True:
+            idx = len(vals)
+            vals.append(getattr(node, attr))
+            right.append(NIL)
+            if node.right is not None:
+                pending.append(node.right)
+                pending_parent.append(idx)
+            if node.left is not None:
+                left.append(idx + 1)
+                node = node.left
+                continue
+            left.append(NIL)
+            if not pending:
+                break
+            node = pending.pop()
+            right[pending_parent.pop()] = len(vals)
+        if not typecode:
+            ct.vals = array(pick_typecode(vals), vals)
+        return ct
+
+    def to_preorder(self):
+        """
+        Копия дерева с нумерацией узлов в прямом порядке (как в from_tree):
+        поддерево каждого узла занимает непрерывный отрезок индексов.
+        """
+        ct = CompactTree(self.typecode)
+        if not len(self.vals):
+            return ct
+        vals = self.vals
+        left = self.left
+        right = self.right
+        new_vals = ct.vals
+        new_left = ct.left
+        new_right = ct.right
+
+        # Тот же обход, что в from_tree, но по индексам
+        pending = array('l')
+        pending_parent = array('l')
+        i = 0
+        while True:
+            idx = len(new_vals)
+            new_vals.append(vals[i])
+            new_right.append(NIL)
+            if right[i] != NIL:
+                pending.append(right[i])
+                pending_parent.append(idx)
+            if left[i] != NIL:
+                new_left.append(idx + 1)
+                i = left[i]
+                continue
+            new_left.append(NIL)
+            if not pending:
+                break
+            i = pending.pop()
+            new_right[pending_parent.pop()] = len(new_vals)
+        return ct
+
+    def to_tree(self, tree_cls=None, node_cls=None):
+        """
+        Обратное преобразование в граф объектов. По умолчанию - Tree/Node
+        из bin_tree; подойдут и классы других заданий (Node(value), Tree()).
+        """
+        if tree_cls is None or node_cls is None:
+            from bin_tree import Tree, Node
+            tree_cls = tree_cls or Tree
+            node_cls = node_cls or Node
+
+        tree = tree_cls()
+        tree.root = None
+        if not len(self.vals):
+            return tree
+
+        # list здесь только для сборки графа объектов
+        nodes = [node_cls(v) for v in self.vals]
+        left = self.left
+        right = self.right
+        for i in range(len(nodes)):
+            if left[i] != NIL:
+                nodes[i].left = nodes[left[i]]
+            if right[i] != NIL:
+                nodes[i].right = nodes[right[i]]
+        tree.root = nodes[0]
+        return tree
+
+
+# ==========================================
+# Алгоритмы над компактным деревом
+# ==========================================
+
+def find_paths_in_range(ct, a, b):
+    """
+    Аналог bin_tree.find_paths_in_range: пути от корня до листа длиной
+    (кол-во ребер) от a до b в формате [len1, v1, v2..., len2, v1...].
+    """
+    # path_stream импортирует этот модуль, поэтому импорт - при вызове
+    from path_stream import iter_subtree_paths
+
+    results = array(ct.typecode)
+    if not len(ct):
+        return results
+    for path in iter_subtree_paths(ct, 0, (), a, b):
+        results.append(len(path))
+        results.extend(path)
+    return results
+
+
+def is_symmetric(ct):
+    """Симметрично ли дерево по значениям относительно корня (итеративно)."""
+    if not len(ct):
+        return True
+
+    vals = ct.vals
+    left = ct.left
+    right = ct.right
+    # Стек пар индексов, которые должны быть зеркальны друг другу
+    pairs = array('i', (left[0], right[0]))
+    while pairs:
+        j = pairs.pop()
+        i = pairs.pop()
+        if i == NIL and j == NIL:
+            continue
+        if i == NIL or j == NIL or vals[i] != vals[j]:
+            return False
+        pairs.append(left[i])
+        pairs.append(right[j])
+        pairs.append(right[i])
+        pairs.append(left[j])
+    return True
+
+
+def summarize(ct):
+    """
+    Сводка дерева за один проход снизу вверх: (height, min, max, flags),
+    height - кол-во узлов на самом длинном пути, flags - маска BST, AVL,
+    LINEAR, ...  Результаты поддеревьев лежат в заранее выделенных массивах
+    (высота, мин, макс, флаги) - без рекурсии и кортежа на узел.
+    Пустое дерево: (0, INF, N_INF, все флаги).
+    """
+    n = len(ct)
+    if n == 0:
+        return 0, INF, N_INF, _ALL_FLAGS
+
+    vals = ct.vals
+    left = ct.left
+    right = ct.right
+    # Значения по умолчанию - это сводка листа
+    height = array('i', [1]) * n
+    sub_min = array(ct.typecode, vals)
+    sub_max = array(ct.typecode, vals)
+    flags = array('B', [_ALL_FLAGS]) * n
+    # Флаги - в локальных переменных: цикл идет по каждому узлу
+    all_flags = _ALL_FLAGS
+    not_bst = ~(BST | AVL)
+    not_avl = ~AVL
+    not_min = ~MIN_ORDERED
+    not_max = ~MAX_ORDERED
+    ordered = BST | AVL | MIN_ORDERED | MAX_ORDERED
+    linear = LINEAR
+    perfect = PERFECT
+    complete = COMPLETE
+
+    # Дети имеют большие индексы, поэтому обратный порядок - это post-order
+    for i in range(n - 1, -1, -1):
+        l = left[i]
+        r = right[i]
+        if l == NIL and r == NIL:
+            continue
+        val = vals[i]
+        f = ordered
+        l_h = r_h = 0
+        l_f = r_f = all_flags
+
+        if l != NIL:
+            l_h = height[l]
+            l_f = flags[l]
+            if not sub_max[l] < val:
+                f &= not_bst
+            child = vals[l]
+            if child < val:
+                f &= not_min
+            elif child > val:
+                f &= not_max
+            if sub_min[l] < sub_min[i]:
+                sub_min[i] = sub_min[l]
+            if sub_max[l] > sub_max[i]:
+                sub_max[i] = sub_max[l]
+        if r != NIL:
+            r_h = height[r]
+            r_f = flags[r]
+            if not val < sub_min[r]:
+                f &= not_bst
+            child = vals[r]
+            if child < val:
+                f &= not_min
+            elif child > val:
+                f &= not_max
+            if sub_min[r] < sub_min[i]:
+                sub_min[i] = sub_min[r]
+            if sub_max[r] > sub_max[i]:
+                sub_max[i] = sub_max[r]
+
+        both = l_f & r_f
+        f &= both
+        if l == NIL or r == NIL:
+            f |= both & linear
+        if l_h != r_h:
+            if l_h - r_h > 1 or r_h - l_h > 1:
+                f &= not_avl
+            elif l_h > r_h and l_f & complete and r_f & perfect:
+                f |= complete
+            height[i] = (l_h if l_h > r_h else r_h) + 1
+        else:
+            if both & perfect:
+                f |= complete | perfect
+            elif l_f & perfect and r_f & complete:
+                f |= complete
+            height[i] = l_h + 1
+        flags[i] = f
+
+    return height[0], sub_min[0], sub_max[0], flags[0]
+
+
+def check_tree_properties(ct, A, B, c, d):
+    """
+    Аналог check_tree_properties из task2.1 за один проход:
+    1. Линейный список с диапазоном значений [c, d].
+    2. АВЛ-дерево с высотой (A, B).
+    Возвращает (is_linear, is_avl).
+    """
+    height, lo, hi, flags = summarize(ct)
+    is_linear = bool(flags & LINEAR) and c <= lo and hi <= d
+    is_avl = bool(flags & AVL) and (A < height < B)
+    return is_linear, is_avl
+
+
+def count_builds(func, *args):
+    """
+    (результат, число инструкций BUILD_*) для func(*args): сколько
+    кортежей, списков, словарей и множеств собрали вызванные
+    Python-функции. Это не все созданные объекты: float('inf'), результаты
+    min/max, числа и все, что создается внутри C-функций, сюда не входят.
+    Зато счетчик видит кортежи из free list интерпретатора, которые
+    tracemalloc не показывает. Трассировка по инструкциям медленная,
+    поэтому - для небольших деревьев.
+    """
+    builds = {op for name, op in dis.opmap.items() if name.startswith('BUILD_')}
+    count = 0
+
+    def tracer(frame, event, arg):
+        nonlocal count
+        if event == 'call':
+            frame.f_trace_opcodes = True
+            frame.f_trace_lines = False
+        elif event == 'opcode' and frame.f_code.co_code[frame.f_lasti] in builds:
+            count += 1
+        return tracer
+
+    sys.settrace(tracer)
+    try:
+        result = func(*args)
+    finally:
+        sys.settrace(None)
+    return result, count
+
+
+# ==========================================
+# Проверка и сравнение с графом объектов
+# ==========================================
+
+if __name__ == "__main__":
+    from bin_tree import Tree, Node
+    from bin_tree import find_paths_in_range as find_paths_nodes
+
+    print("=== Конвертация туда и обратно ===")
+    #      1
+    #     / \
+    #    2   3
+    #   /     \
+    #  4       5
+    t = Tree()
+    t.root = Node(1)
+    t.root.left = Node(2)
+    t.root.left.left = Node(4)
+    t.root.right = Node(3)
+    t.root.right.right = Node(5)
+    ct = CompactTree.from_tree(t)
+    print(f"vals={ct.vals.tolist()} left={ct.left.tolist()} right={ct.right.tolist()}")
+    back = CompactTree.from_tree(ct.to_tree())
+    print(f"После обратной конвертации совпадает: {back.vals == ct.vals and back.left == ct.left}")
+    print(f"Пути [2, 2]: {find_paths_in_range(ct, 2, 2).tolist()}")
+
+    print("\n=== Симметрия ===")
+    sym = CompactTree()
+    r = sym.add_node(1)
+    sym.add_node(2, r, True)
+    sym.add_node(2, r, False)
+    print(f"1 / 2 2 симметрично: {is_symmetric(sym)}")
+    print(f"Дерево выше симметрично: {is_symmetric(ct)}")
+
+    print("\n=== Свойства (линейный список / АВЛ) ===")
+    avl = CompactTree()
+    r = avl.add_node(2)
+    avl.add_node(1, r, True)
+    avl.add_node(3, r, False)
+    print(f"1<-2->3, A=1, B=5: {check_tree_properties(avl, 1, 5, 0, 10)}")
+
+    print("\n=== Память и время на случайном дереве ===")
+    n = 200000
+    t = Tree()
+    for v in range(n):
+        t.insert_random(v)
+    ct = CompactTree.from_tree(t)
+
+    nodes_bytes = n * sys.getsizeof(t.root)
+    print(f"N={n}: Node-граф ~{nodes_bytes / 2**20:.1f} МБ, CompactTree {ct.nbytes() / 2**20:.1f} МБ")
+
+    start = time.perf_counter()
+    res_nodes = find_paths_nodes(t, 0, n)
+    mid = time.perf_counter()
+    res_compact = find_paths_in_range(ct, 0, n)
+    end = time.perf_counter()
+    print(f"Пути совпадают: {res_nodes == res_compact}")
+    print(f"Node: {mid - start:.4f} сек, CompactTree: {end - mid:.4f} сек")
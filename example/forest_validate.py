@@ -0,0 +1,208 @@
+import sys
+import time
+from array import array
+
+from compact_tree import CompactTree, NIL
+from validator import ALL, PROPERTY_NAMES, names, validate, validate_compact
+
+# Свойства в порядке битов маски: столбец k матрицы - флаг 1 << k
+_FLAGS = sorted(PROPERTY_NAMES)
+
+# bytes.translate: байт маски -> b'1' (49) или b'0' (48) по биту k = 0..7
+_BIT_TABLES = [bytes(49 if byte >> k & 1 else 48 for byte in range(256))
+               for k in range(8)]
+
+
+class Forest:
+    """
+    Лес в общих буферах: деревья лежат друг за другом в одном CompactTree
+    (каждое - в прямом порядке), индексы детей - сквозные, roots[t] -
+    индекс корня дерева t (NIL у пустого дерева). Тысячи маленьких
+    деревьев - это три массива, а не тысячи объектов.
+    """
+    __slots__ = ('ct', 'roots')
+
+    def __init__(self, typecode='i'):
+        self.ct = CompactTree(typecode)
+        self.roots = array('l')
+
+    def __len__(self):
+        return len(self.roots)
+
+    def add(self, tree):
+        """Дописывает дерево (Tree/Node любого задания или CompactTree) в конец леса."""
+        ct = self.ct
+        sub = tree if isinstance(tree, CompactTree) else CompactTree.from_tree(tree, ct.typecode)
+        offset = len(ct)
+        if not len(sub):
+            self.roots.append(NIL)
+            return
+        ct.vals.extend(sub.vals)
+        ct.left.extend(array('i', [x + offset if x != NIL else NIL for x in sub.left]))
+        ct.right.extend(array('i', [x + offset if x != NIL else NIL for x in sub.right]))
+        self.roots.append(offset)
+
+    @classmethod
+    def from_roots(cls, trees, typecode='i'):
+        forest = cls(typecode)
+        for tree in trees:
+            forest.add(tree)
+        return forest
+
+    def nbytes(self):
+        return self.ct.nbytes() + len(self.roots) * self.roots.itemsize
+
+
+class ResultMatrix:
+    """
+    Результаты проверки леса: матрица деревья x свойства по 1 биту.
+    Столбец свойства - одно целое, где бит t - выполняется ли свойство
+    у дерева t. Подсчеты - это & / | столбцов и int.bit_count, т.е.
+    popcount по машинным словам внутри длинной арифметики, без цикла по
+    деревьям на Python.
+    """
+    __slots__ = ('n', 'props', 'columns')
+
+    def __init__(self, rows, props):
+        """rows - array('H') масок validate, по одной на дерево."""
+        self.n = len(rows)
+        self.props = props
+        raw = rows.tobytes()
+        if sys.byteorder == 'big':
+            swapped = array('H', rows)
+            swapped.byteswap()
+            raw = swapped.tobytes()
+        # Младшие и старшие байты масок: столбец собирается из строки
+        # '0'/'1' (дерево 0 - младший бит, поэтому строка переворачивается)
+        halves = (raw[0::2], raw[1::2])
+        self.columns = {}
+        for k, flag in enumerate(_FLAGS):
+            if props & flag:
+                bits = halves[k >> 3].translate(_BIT_TABLES[k & 7])
+                self.columns[flag] = int(bits[::-1] or b'0', 2)
+
+    def __len__(self):
+        return self.n
+
+    def _column(self, flag):
+        if flag not in self.columns:
+            raise KeyError(f"Свойство {PROPERTY_NAMES.get(flag, flag)} не проверялось")
+        return self.columns[flag]
+
+    def _all(self, mask):
+        bits = (1 << self.n) - 1
+        for flag in _FLAGS:
+            if mask & flag:
+                bits &= self._column(flag)
+        return bits
+
+    def _any(self, mask):
+        bits = 0
+        for flag in _FLAGS:
+            if mask & flag:
+                bits |= self._column(flag)
+        return bits
+
+    def count(self, flag):
+        """Количество деревьев со свойством flag."""
+        return self._column(flag).bit_count()
+
+    def count_all(self, mask):
+        """Количество деревьев, у которых выполняются все свойства mask."""
+        return self._all(mask).bit_count()
+
+    def count_any(self, mask):
+        """Количество деревьев, у которых выполняется хотя бы одно свойство mask."""
+        return self._any(mask).bit_count()
+
+    def trees(self, mask, any_of=False):
+        """Номера деревьев со всеми (any_of=True - хоть одним) свойствами mask."""
+        bits = self._any(mask) if any_of else self._all(mask)
+        while bits:
+            low = bits & -bits
+            yield low.bit_length() - 1
+            bits ^= low
+
+    def row(self, t):
+        """Маска свойств дерева t, как вернул бы validate."""
+        if not 0 <= t < self.n:
+            raise IndexError("Номер дерева вне леса")
+        mask = 0
+        for flag, column in self.columns.items():
+            if column >> t & 1:
+                mask |= flag
+        return mask
+
+    def summary(self):
+        """{имя свойства: количество деревьев}."""
+        return {PROPERTY_NAMES[flag]: column.bit_count() for flag, column in self.columns.items()}
+
+    def nbytes(self):
+        """Объем битовых столбцов: ~N/8 байт на свойство."""
+        return sum((column.bit_length() + 7) // 8 for column in self.columns.values())
+
+
+def validate_forest(forest, props=ALL, value_range=None, height_window=None):
+    """
+    Проверяет свойства props у каждого дерева леса и возвращает ResultMatrix.
+    forest - Forest (общие буферы, проверка по индексам без объектов) или
+    любая последовательность Tree/Node/CompactTree; параметры - как у validate.
+    """
+    rows = array('H')
+    if isinstance(forest, Forest):
+        ct = forest.ct
+        for root in forest.roots:
+            rows.append(validate_compact(ct, props, value_range, height_window, root))
+    else:
+        for tree in forest:
+            if isinstance(tree, CompactTree):
+                rows.append(validate_compact(tree, props, value_range, height_window))
+            else:
+                rows.append(validate(tree, props, value_range, height_window))
+    return ResultMatrix(rows, props)
+
+
+if __name__ == "__main__":
+    import random
+    from validator import BST, AVL, MIN_HEAP, MAX_HEAP, COMPLETE, PERFECT, HEIGHT
+    from tree_builders import SHAPES, build_tree
+
+    rng = random.Random(1)
+    count = 20000
+    trees = []
+    for t in range(count):
+        shape = rng.choice(SHAPES)
+        n = rng.randint(0, 40)
+        if shape == 'complete' and rng.random() < 0.5:
+            trees.append(build_tree(n, shape, values=range(n), compact=True))
+        else:
+            trees.append(build_tree(n, shape, seed=t, compact=True))
+
+    start = time.perf_counter()
+    forest = Forest.from_roots(trees)
+    build_time = time.perf_counter() - start
+    print(f"Лес: {len(forest)} деревьев, {len(forest.ct)} узлов, "
+          f"{forest.nbytes() / 2**20:.2f} МБ, сборка {build_time:.3f} сек")
+
+    window = dict(value_range=(-100, 100), height_window=(0, 8))
+    start = time.perf_counter()
+    matrix = validate_forest(forest, ALL, **window)
+    elapsed = time.perf_counter() - start
+    print(f"Проверка всех свойств: {elapsed:.3f} сек ({count / elapsed:.0f} деревьев/сек)")
+
+    nodes = [ct.to_tree() for ct in trees[:2000]]
+    same = all(matrix.row(t) == validate(tree, ALL, **window) for t, tree in enumerate(nodes))
+    print(f"Совпадает с validate по графу объектов: {same}")
+
+    print(f"\nМатрица: {matrix.nbytes()} байт (по байту на флаг: {count * len(_FLAGS)})")
+    for name, k in matrix.summary().items():
+        print(f"    {name:<9} {k}")
+    print(f"АВЛ и HEIGHT: {matrix.count_all(AVL | HEIGHT)}")
+    print(f"Хоть одна куча: {matrix.count_any(MIN_HEAP | MAX_HEAP)}")
+    print(f"Полные, но не идеальные: {matrix.count(COMPLETE) - matrix.count_all(COMPLETE | PERFECT)}")
+    print(f"Первые BST-деревья: {list(matrix.trees(BST))[:10]}, дерево 0: {names(matrix.row(0))}")
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        matrix.count_all(BST | HEIGHT)
+    print(f"1000 запросов count_all: {time.perf_counter() - start:.4f} сек")
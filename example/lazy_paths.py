@@ -0,0 +1,60 @@
+from array import array
+
+from compact_tree import NIL, buffer_typecode
+
+
+class LazyPaths:
+    """
+    Результат поиска путей без копирования самих путей.
+
+    Хранит только индексы подходящих листьев и массив родителей (общий
+    для всех путей), путь от корня до листа восстанавливается по требованию
+    за O(длины пути). Память результата - O(кол-ва листьев), а не
+    O(суммарной длины путей), поэтому узнать количество путей или взять
+    первые несколько можно без построения всех.
+
+    Поддерживает len(), итерацию (пути как array), индексацию и срезы
+    (срез - снова LazyPaths над теми же массивами).
+    """
+    __slots__ = ('vals', 'parent', 'leaves')
+
+    def __init__(self, vals, parent, leaves):
+        self.vals = vals
+        self.parent = parent
+        self.leaves = leaves
+
+    def __len__(self):
+        return len(self.leaves)
+
+    def path(self, leaf):
+        """Путь (значения узлов) от корня до узла с индексом leaf."""
+        vals = self.vals
+        parent = self.parent
+        path = array(buffer_typecode(vals))
+        i = leaf
+        while i != NIL:
+            path.append(vals[i])
+            i = parent[i]
+        path.reverse()
+        return path
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return LazyPaths(self.vals, self.parent, self.leaves[k])
+        return self.path(self.leaves[k])
+
+    def __iter__(self):
+        for leaf in self.leaves:
+            yield self.path(leaf)
+
+    def flat(self):
+        """Все пути в плоском формате bin_tree: [len1, v1, v2..., len2, ...]."""
+        results = array(buffer_typecode(self.vals))
+        for leaf in self.leaves:
+            path = self.path(leaf)
+            results.append(len(path))
+            results.extend(path)
+        return results
+
+    def __repr__(self):
+        return f"LazyPaths({len(self.leaves)} paths)"
@@ -0,0 +1,184 @@
+from array import array
+from bisect import bisect_left, insort
+from math import ceil, floor
+
+# Ключ индекса - одно целое (значение << _SEQ_BITS) | seq: порядок как у
+# пары (значение, seq), но int сравниваются в bisect вдвое быстрее кортежей
+_SEQ_BITS = 40
+_SEQ_MASK = (1 << _SEQ_BITS) - 1
+
+# Размер блока _SortedKeys: вставка сдвигает не больше 2 * _LOAD элементов
+_LOAD = 512
+
+
+class _SortedKeys:
+    """
+    Отсортированная последовательность ключей, разбитая на блоки по
+    _LOAD..2*_LOAD элементов, плюс список максимумов блоков. Вставка и
+    удаление - бинарный поиск блока и сдвиг внутри одного блока, т.е.
+    O(log N + _LOAD) вместо O(N) у insort в один плоский список.
+    """
+    __slots__ = ('blocks', 'maxes')
+
+    def __init__(self):
+        self.blocks = []
+        self.maxes = []
+
+    def __len__(self):
+        return sum(map(len, self.blocks))
+
+    def add(self, key):
+        blocks = self.blocks
+        maxes = self.maxes
+        if not blocks:
+            blocks.append([key])
+            maxes.append(key)
+            return
+        i = bisect_left(maxes, key)
+        if i == len(maxes):
+            i -= 1
+        block = blocks[i]
+        insort(block, key)
+        maxes[i] = block[-1]
+        if len(block) > 2 * _LOAD:
+            # Делим переполненный блок пополам
+            blocks.insert(i + 1, block[_LOAD:])
+            del block[_LOAD:]
+            maxes.insert(i, block[-1])
+
+    def remove(self, key):
+        i = bisect_left(self.maxes, key)
+        block = self.blocks[i]
+        del block[bisect_left(block, key)]
+        if block:
+            self.maxes[i] = block[-1]
+        else:
+            del self.blocks[i]
+            del self.maxes[i]
+
+    def _locate(self, key):
+        """(номер блока, позиция в блоке) первого элемента >= key."""
+        i = bisect_left(self.maxes, key)
+        if i == len(self.maxes):
+            return i, 0
+        return i, bisect_left(self.blocks[i], key)
+
+    def count(self, lo, hi):
+        """Количество ключей в [lo, hi)."""
+        i1, j1 = self._locate(lo)
+        i2, j2 = self._locate(hi)
+        if i1 == i2:
+            return j2 - j1
+        return len(self.blocks[i1]) - j1 + sum(map(len, self.blocks[i1 + 1:i2])) + j2
+
+    def irange(self, lo, hi):
+        """Ключи из [lo, hi) по возрастанию."""
+        i1, j1 = self._locate(lo)
+        i2, j2 = self._locate(hi)
+        blocks = self.blocks
+        for i in range(i1, min(i2 + 1, len(blocks))):
+            block = blocks[i]
+            yield from block[j1 if i == i1 else 0:j2 if i == i2 else len(block)]
+
+
+class LeafIndex:
+    """
+    Индекс листьев дерева по глубине (кол-во ребер) и сумме пути от корня.
+
+    Листья лежат в двух отсортированных последовательностях ключей
+    (depth, seq) и (sum, seq) - _SortedKeys, где seq - номер листа
+    (значения узлов - целые, как в array('i') у bin_tree). Запросы
+    "сколько листьев с глубиной или суммой в [a, b]" - бинарные поиски и
+    сумма длин блоков между ними; перечисление найденных - еще O(k).
+    Вставка листа меняет индекс локально: новый лист добавляется, а его
+    родитель, если был листом, удаляется - сдвиг внутри одного блока,
+    без обхода дерева.
+
+    Индекс знает только о вставках через Tree.insert_random; ручное
+    присваивание node.left/right его не обновляет.
+    """
+
+    def __init__(self):
+        self.by_depth = _SortedKeys()
+        self.by_sum = _SortedKeys()
+        # node -> (depth, sum, seq) для листьев
+        self.info = {}
+        # seq -> node
+        self.nodes = {}
+        self._next_seq = 0
+
+    def __len__(self):
+        """Количество листьев."""
+        return len(self.info)
+
+    @classmethod
+    def from_tree(cls, tree):
+        """Строит индекс по существующему дереву итеративным обходом, O(N log N)."""
+        index = cls()
+        if tree.root is None:
+            return index
+        stack = [tree.root]
+        depths = array('l', (0,))
+        sums = [tree.root.val]
+        while stack:
+            node = stack.pop()
+            depth = depths.pop()
+            s = sums.pop()
+            if node.left is None and node.right is None:
+                index.add_leaf(node, depth, s)
+                continue
+            for child in (node.right, node.left):
+                if child is not None:
+                    stack.append(child)
+                    depths.append(depth + 1)
+                    sums.append(s + child.val)
+        return index
+
+    def add_leaf(self, node, depth, s):
+        seq = self._next_seq
+        self._next_seq += 1
+        self.info[node] = (depth, s, seq)
+        self.nodes[seq] = node
+        self.by_depth.add(depth << _SEQ_BITS | seq)
+        self.by_sum.add(s << _SEQ_BITS | seq)
+
+    def remove_leaf(self, node):
+        depth, s, seq = self.info.pop(node)
+        del self.nodes[seq]
+        self.by_depth.remove(depth << _SEQ_BITS | seq)
+        self.by_sum.remove(s << _SEQ_BITS | seq)
+
+    def on_insert(self, parent, parent_depth, parent_sum, child):
+        """Узел child подвешен к parent (глубина и сумма пути parent известны)."""
+        if parent in self.info:
+            self.remove_leaf(parent)
+        self.add_leaf(child, parent_depth + 1, parent_sum + child.val)
+
+    # --- Запросы ---
+
+    # Ключи со значением в [a, b] - это отрезок [a << _SEQ_BITS, (b + 1) << _SEQ_BITS)
+
+    @staticmethod
+    def _range(a, b):
+        return ceil(a) << _SEQ_BITS, (floor(b) + 1) << _SEQ_BITS
+
+    def _count(self, keys, a, b):
+        return keys.count(*self._range(a, b)) if a <= b else 0
+
+    def _leaves(self, keys, a, b):
+        if a > b:
+            return []
+        nodes = self.nodes
+        return [nodes[key & _SEQ_MASK] for key in keys.irange(*self._range(a, b))]
+
+    def count_by_depth(self, a, b):
+        return self._count(self.by_depth, a, b)
+
+    def leaves_by_depth(self, a, b):
+        return self._leaves(self.by_depth, a, b)
+
+    def count_by_sum(self, a, b):
+        return self._count(self.by_sum, a, b)
+
+    def leaves_by_sum(self, a, b):
+        return self._leaves(self.by_sum, a, b)
@@ -0,0 +1,219 @@
+import os
+import time
+from array import array
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+from compact_tree import CompactTree, NIL, find_paths_in_range
+from path_stream import iter_subtree_paths, min_max_paths
+
+# Деревья меньше этого размера обходятся в текущем процессе:
+# запуск пула и пересылка результатов дороже самого обхода
+MIN_PARALLEL_NODES = 50000
+
+# Дерево в процессе-обработчике (заполняет _attach): CompactTree, буферы
+# которого - memoryview на общую память
+_shm = None
+_tree = None
+
+
+# ==========================================
+# 1. Общая память и разбиение на поддеревья
+# ==========================================
+
+def _share(shm, ct):
+    """Копирует три буфера компактного дерева в блок общей памяти подряд."""
+    offset = 0
+    for buf in (ct.vals, ct.left, ct.right):
+        data = buf.tobytes()
+        shm.buf[offset:offset + len(data)] = data
+        offset += len(data)
+
+
+def _attach(name, n, typecode):
+    """
+    Инициализатор процесса пула: подключает буферы дерева без копирования.
+    Раскладка - как в _share: vals в typecode дерева, затем left и right
+    в 'i'.
+    """
+    global _shm, _tree
+    _shm = SharedMemory(name=name)
+    buf = _shm.buf
+    item = array(typecode).itemsize
+    index_item = array('i').itemsize
+    _tree = CompactTree(typecode)
+    _tree.vals = buf[0:n * item].cast(typecode)
+    _tree.left = buf[n * item:n * item + n * index_item].cast('i')
+    _tree.right = buf[n * item + n * index_item:n * item + 2 * n * index_item].cast('i')
+
+
+def _split(ct, parts):
+    """
+    Разрезает верхушку дерева обходом в ширину, пока фронт не наберет
+    parts поддеревьев. Возвращает задачи (индекс корня поддерева, префикс -
+    значения предков), упорядоченные по индексу: в прямом порядке
+    нумерации это совпадает с порядком обхода слева направо. Листья
+    верхушки тоже попадают в задачи (поддерево из 1 узла).
+    """
+    vals = ct.vals
+    left = ct.left
+    right = ct.right
+    typecode = ct.typecode
+    frontier = [(0, array(typecode))]
+    # Вырожденное дерево не расширяет фронт - ограничиваем число уровней
+    for _ in range(64):
+        if len(frontier) >= parts:
+            break
+        next_frontier = []
+        grew = False
+        for idx, prefix in frontier:
+            l = left[idx]
+            r = right[idx]
+            if l == NIL and r == NIL:
+                next_frontier.append((idx, prefix))
+                continue
+            grew = True
+            child_prefix = prefix + array(typecode, (vals[idx],))
+            for child in (l, r):
+                if child != NIL:
+                    next_frontier.append((child, child_prefix))
+        frontier = next_frontier
+        if not grew:
+            break
+    frontier.sort(key=lambda task: task[0])
+    return frontier
+
+
+def _run(ct, worker, tasks, workers):
+    """Выполняет задачи в пуле над деревом в общей памяти, порядок сохраняется."""
+    # Блок создается внутри try: при любой ошибке (в том числе при
+    # копировании буферов) он будет удален
+    shm = None
+    try:
+        shm = SharedMemory(create=True, size=max(1, ct.nbytes()))
+        _share(shm, ct)
+        initargs = (shm.name, len(ct), ct.typecode)
+        with Pool(workers, initializer=_attach, initargs=initargs) as pool:
+            return pool.starmap(worker, tasks, chunksize=1)
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+
+# ==========================================
+# 2. Поиск путей длиной [a, b]
+# ==========================================
+
+def _subtree_paths(root, prefix, a, b):
+    """Пути поддерева в формате bin_tree, сразу с префиксом от корня дерева."""
+    results = array(_tree.typecode)
+    for path in iter_subtree_paths(_tree, root, prefix, a, b):
+        results.append(len(path))
+        results.extend(path)
+    return results
+
+
+def parallel_find_paths_in_range(tree, a, b, workers=None, tasks_per_worker=4):
+    """
+    Параллельный аналог bin_tree.find_paths_in_range (тот же формат и
+    порядок путей). Дерево переводится в CompactTree и кладется в общую
+    память, поэтому процессам передаются только номера поддеревьев.
+    Готовый CompactTree должен быть пронумерован в прямом порядке
+    (как в from_tree) - на этом держится порядок результатов.
+    """
+    ct = tree if isinstance(tree, CompactTree) else CompactTree.from_tree(tree)
+    if not len(ct):
+        return array(ct.typecode)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(ct) < MIN_PARALLEL_NODES:
+        return find_paths_in_range(ct, a, b)
+
+    tasks = [(idx, prefix, a, b) for idx, prefix in _split(ct, workers * tasks_per_worker)]
+    results = array(ct.typecode)
+    for part in _run(ct, _subtree_paths, tasks, workers):
+        results.extend(part)
+    return results
+
+
+# ==========================================
+# 3. Пути с минимальной и максимальной суммой (3388XX)
+# ==========================================
+
+def _subtree_min_max(root, prefix):
+    """(min_sum, min_path, max_sum, max_path) по путям поддерева с префиксом."""
+    return min_max_paths(iter_subtree_paths(_tree, root, prefix, details=True))
+
+
+def parallel_find_min_max_paths(tree, workers=None, tasks_per_worker=4):
+    """
+    Параллельный аналог Tree.find_min_max_paths из 3388XX
+    (CompactTree - в прямом порядке, как в from_tree).
+    Возвращает (min_path, max_path, min_sum, max_sum) или None для пустого дерева.
+    """
+    ct = tree if isinstance(tree, CompactTree) else CompactTree.from_tree(tree)
+    if not len(ct):
+        return None
+    workers = workers or os.cpu_count() or 1
+
+    tasks = _split(ct, workers * tasks_per_worker)
+    if workers == 1 or len(ct) < MIN_PARALLEL_NODES:
+        _attach_local(ct)
+        parts = [_subtree_min_max(*task) for task in tasks]
+    else:
+        parts = _run(ct, _subtree_min_max, tasks, workers)
+
+    # Задачи идут слева направо, строгие сравнения сохраняют выбор 3388XX
+    best_min = best_max = None
+    for min_sum, min_path, max_sum, max_path in parts:
+        if best_min is None or min_sum < best_min[0]:
+            best_min = (min_sum, min_path)
+        if best_max is None or max_sum > best_max[0]:
+            best_max = (max_sum, max_path)
+    return best_min[1], best_max[1], best_min[0], best_max[0]
+
+
+def _attach_local(ct):
+    """Последовательный режим: те же функции работают прямо с ct."""
+    global _tree
+    _tree = ct
+
+
+if __name__ == "__main__":
+    import random
+    from bin_tree import Tree, Node
+    from bin_tree import find_paths_in_range as find_paths_nodes
+
+    workers = os.cpu_count() or 1
+    print(f"Процессов: {workers}")
+
+    for n in (100000, 400000):
+        # Случайное дерево за O(N), как в graphics.performance_test
+        nodes = [Node(random.randint(-100, 100)) for _ in range(n)]
+        for i in range(1, n):
+            parent = nodes[random.randint(0, i - 1)]
+            if parent.left is None:
+                parent.left = nodes[i]
+            elif parent.right is None:
+                parent.right = nodes[i]
+            else:
+                prev = nodes[i - 1]
+                if prev.left is None:
+                    prev.left = nodes[i]
+                else:
+                    prev.right = nodes[i]
+        t = Tree()
+        t.root = nodes[0]
+        ct = CompactTree.from_tree(t)
+
+        start = time.perf_counter()
+        expected = find_paths_nodes(t, 0, n)
+        mid = time.perf_counter()
+        got = parallel_find_paths_in_range(ct, 0, n, workers=max(2, workers))
+        end = time.perf_counter()
+        print(f"N={n}: пути совпадают {got == expected}, "
+              f"1 процесс {mid - start:.3f} сек, пул {end - mid:.3f} сек")
+
+        seq = parallel_find_min_max_paths(ct, workers=1)
+        par = parallel_find_min_max_paths(ct, workers=max(2, workers))
+        print(f"    мин/макс суммы {seq[2]}/{seq[3]}, пул совпадает: {seq == par}")
@@ -0,0 +1,168 @@
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+from compact_tree import CompactTree, NIL
+from lazy_paths import LazyPaths
+from path_kernels import tree_arrays, HAS_NUMPY
+
+if HAS_NUMPY:
+    import numpy as np
+
+
+class PathIndex:
+    """
+    Ответы на много запросов "пути с длиной/суммой в [a, b]" за один обход.
+
+    При построении дерево обходится один раз (ядро path_kernels), листья
+    раскладываются по глубине (сортировка подсчетом) и по сумме пути.
+    Дальше любой запрос - это два поиска в отсортированных массивах:
+    количество путей - O(1) для длины и O(log L) для суммы, а сами пути
+    отдаются лениво через LazyPaths.
+    """
+
+    def __init__(self, tree):
+        if not isinstance(tree, CompactTree):
+            tree = CompactTree.from_tree(tree)
+        self.tree = tree
+        parent, depth, sums = tree_arrays(tree)
+
+        if HAS_NUMPY:
+            left = np.frombuffer(tree.left, dtype=tree.left.typecode)
+            right = np.frombuffer(tree.right, dtype=tree.right.typecode)
+            leaves = np.flatnonzero((left == NIL) & (right == NIL))
+            leaf_depth = depth[leaves]
+            by_depth = leaves[np.argsort(leaf_depth, kind='stable')]
+            by_sum_order = np.argsort(sums[leaves], kind='stable')
+            self.parent = array('i', parent.tobytes())
+            self.by_depth = array('i', by_depth.astype(np.int32).tobytes())
+            self.depth_offsets = array('l', np.concatenate(
+                ([0], np.cumsum(np.bincount(leaf_depth)))).astype(np.int64).tobytes())
+            self.by_sum = array('i', leaves[by_sum_order].astype(np.int32).tobytes())
+            self.sorted_sums = array('q', sums[leaves][by_sum_order].astype(np.int64).tobytes())
+            return
+
+        left = tree.left
+        right = tree.right
+        leaves = array('i', (i for i in range(len(tree))
+                             if left[i] == NIL and right[i] == NIL))
+        self.parent = parent
+
+        # Сортировка подсчетом по глубине: depth_offsets[d] - начало блока глубины d
+        max_depth = max((depth[i] for i in leaves), default=-1)
+        offsets = array('l', [0]) * (max_depth + 2)
+        for i in leaves:
+            offsets[depth[i] + 1] += 1
+        for d in range(1, len(offsets)):
+            offsets[d] += offsets[d - 1]
+        by_depth = array('i', [0]) * len(leaves)
+        fill = array('l', offsets)
+        for i in leaves:
+            d = depth[i]
+            by_depth[fill[d]] = i
+            fill[d] += 1
+        self.by_depth = by_depth
+        self.depth_offsets = offsets
+
+        self.by_sum = array('i', sorted(leaves, key=sums.__getitem__))
+        self.sorted_sums = array('q', (sums[i] for i in self.by_sum))
+
+    def __len__(self):
+        """Общее количество путей от корня до листа."""
+        return len(self.by_depth)
+
+    def _depth_bounds(self, a, b):
+        offsets = self.depth_offsets
+        top = len(offsets) - 1
+        a = max(a, 0)
+        b = min(b, top - 1)
+        if a > b:
+            return 0, 0
+        return offsets[a], offsets[b + 1]
+
+    def _sum_bounds(self, a, b):
+        if a > b:
+            return 0, 0
+        return bisect_left(self.sorted_sums, a), bisect_right(self.sorted_sums, b)
+
+    def _lazy(self, leaves):
+        # Возвращаем пути в порядке обхода дерева, как прежние функции
+        return LazyPaths(self.tree.vals, self.parent, array('i', sorted(leaves)))
+
+    def count_by_length(self, a, b):
+        """Количество путей длиной (кол-во ребер) в [a, b]."""
+        lo, hi = self._depth_bounds(a, b)
+        return hi - lo
+
+    def paths_by_length(self, a, b):
+        lo, hi = self._depth_bounds(a, b)
+        return self._lazy(self.by_depth[lo:hi])
+
+    def count_by_sum(self, a, b):
+        """Количество путей с суммой значений в [a, b]."""
+        lo, hi = self._sum_bounds(a, b)
+        return hi - lo
+
+    def paths_by_sum(self, a, b):
+        lo, hi = self._sum_bounds(a, b)
+        return self._lazy(self.by_sum[lo:hi])
+
+
+def answer_queries(tree, length_windows=(), sum_windows=()):
+    """
+    Пакетный ответ на окна длины и суммы за один обход дерева.
+    Возвращает (length_counts, sum_counts, index): количества путей по
+    каждому окну в порядке запросов и PathIndex для ленивого получения путей.
+    """
+    index = PathIndex(tree)
+    length_counts = array('l', (index.count_by_length(a, b) for a, b in length_windows))
+    sum_counts = array('l', (index.count_by_sum(a, b) for a, b in sum_windows))
+    return length_counts, sum_counts, index
+
+
+if __name__ == "__main__":
+    import random
+    from bin_tree import Tree, Node, find_paths_in_range
+
+    #      1
+    #     / \
+    #    2   3
+    #   /     \
+    #  4       5
+    #           \
+    #            6
+    t = Tree()
+    t.root = Node(1)
+    t.root.left = Node(2)
+    t.root.left.left = Node(4)
+    t.root.right = Node(3)
+    t.root.right.right = Node(5)
+    t.root.right.right.right = Node(6)
+
+    lengths, sums, index = answer_queries(t, [(0, 1), (2, 2), (2, 3)], [(7, 7), (0, 100)])
+    print(f"Количество путей по окнам длины: {lengths.tolist()}")   # [0, 1, 2]
+    print(f"Количество путей по окнам суммы: {sums.tolist()}")      # [1, 2]
+    print(f"Пути длиной [2, 3]: {[p.tolist() for p in index.paths_by_length(2, 3)]}")
+
+    print("\n=== 100 окон длины на одном дереве ===")
+    n = 100000
+    t = Tree()
+    for v in range(n):
+        t.insert_random(v)
+    windows = [(a, a + random.randint(0, 5)) for a in (random.randint(0, 40) for _ in range(100))]
+
+    start = time.perf_counter()
+    expected = []
+    for a, b in windows:
+        flat = find_paths_in_range(t, a, b)
+        count = 0
+        i = 0
+        while i < len(flat):
+            i += flat[i] + 1
+            count += 1
+        expected.append(count)
+    mid = time.perf_counter()
+    counts, _, _ = answer_queries(t, windows)
+    end = time.perf_counter()
+    print(f"Совпадает с find_paths_in_range: {counts.tolist() == expected}")
+    print(f"Повторные обходы: {mid - start:.3f} сек, один проход + поиск: {end - mid:.3f} сек")
@@ -0,0 +1,241 @@
+import io
+import time
+from array import array
+
+# Формат с общими префиксами: каждый путь - запись
+#   [shared, k, v1, ..., vk]
+# где shared - длина общего префикса с предыдущим путем, а v1..vk - новый
+# суффикс. Пути из одного обхода дерева делят префикс от корня, поэтому
+# при выгрузке всех путей каждый узел записывается примерно один раз:
+# объем ~ N + 2 * (кол-во листьев) чисел вместо N * H у плоского формата.
+# В файл записи пишутся как int32 в порядке байт машины.
+
+_ITEM = array('i').itemsize
+
+
+class PrefixWriter:
+    """
+    Потоковый кодировщик путей. Пишет в array('i') (по умолчанию) или в
+    бинарный файл out, сбрасывая буфер каждые flush_items чисел, так что
+    память не зависит от объема выгрузки.
+    """
+
+    def __init__(self, out=None, flush_items=1 << 16):
+        self.out = out
+        self.flush_items = flush_items
+        self.buffer = array('i')
+        self.prev = array('i')
+        self.count = 0
+
+    def add(self, path):
+        """Добавляет путь, общий префикс с предыдущим считается сравнением."""
+        prev = self.prev
+        limit = min(len(prev), len(path))
+        shared = 0
+        while shared < limit and prev[shared] == path[shared]:
+            shared += 1
+        self.add_suffix(shared, path[shared:])
+
+    def add_suffix(self, shared, suffix):
+        """Добавляет путь, когда длина общего префикса уже известна."""
+        buf = self.buffer
+        buf.append(shared)
+        buf.append(len(suffix))
+        buf.extend(suffix)
+        del self.prev[shared:]
+        self.prev.extend(suffix)
+        self.count += 1
+        if self.out is not None and len(buf) >= self.flush_items:
+            self.flush()
+
+    def flush(self):
+        if self.out is not None and self.buffer:
+            self.out.write(self.buffer.tobytes())
+            del self.buffer[:]
+
+    def getvalue(self):
+        """Закодированные записи (только при записи в память)."""
+        return self.buffer
+
+
+def iter_decode(encoded):
+    """Генератор путей (каждый путь - новый array) из закодированного array."""
+    path = array('i')
+    pos = 0
+    n = len(encoded)
+    while pos < n:
+        shared = encoded[pos]
+        k = encoded[pos + 1]
+        pos += 2
+        del path[shared:]
+        path.extend(encoded[pos:pos + k])
+        pos += k
+        yield array('i', path)
+
+
+def iter_decode_file(f, chunk_items=1 << 16):
+    """Потоковое декодирование из бинарного файла, память - O(chunk + H)."""
+    buf = array('i')
+    tail = b''
+    path = array('i')
+    pos = 0
+    while True:
+        data = f.read(chunk_items * _ITEM)
+        if data:
+            data = tail + data
+            usable = len(data) - len(data) % _ITEM
+            tail = data[usable:]
+            del buf[:pos]
+            pos = 0
+            buf.frombytes(data[:usable])
+
+        # Разбираем все записи, полностью попавшие в буфер
+        n = len(buf)
+        while pos + 2 <= n and pos + 2 + buf[pos + 1] <= n:
+            shared = buf[pos]
+            k = buf[pos + 1]
+            pos += 2
+            del path[shared:]
+            path.extend(buf[pos:pos + k])
+            pos += k
+            yield array('i', path)
+
+        if not data:
+            break
+
+
+def decode_to_flat(encoded):
+    """Обратно в плоский формат bin_tree: [len1, v1, v2..., len2, ...]."""
+    flat = array('i')
+    for path in iter_decode(encoded):
+        flat.append(len(path))
+        flat.extend(path)
+    return flat
+
+
+# ==========================================
+# Кодирование существующих форматов результатов
+# ==========================================
+
+def encode_flat(flat, out=None):
+    """Из формата find_paths_in_range: [len1, v1, v2..., len2, ...]."""
+    writer = PrefixWriter(out)
+    i = 0
+    while i < len(flat):
+        length = flat[i]
+        writer.add(flat[i + 1:i + 1 + length])
+        i += 1 + length
+    writer.flush()
+    return writer.getvalue()
+
+
+def encode_pairs(flat_results, result_lengths, out=None):
+    """Из пары (flat_results, result_lengths) get_paths_outside_range (Exam)."""
+    writer = PrefixWriter(out)
+    offset = 0
+    for length in result_lengths:
+        writer.add(flat_results[offset:offset + length])
+        offset += length
+    writer.flush()
+    return writer.getvalue()
+
+
+def encode_paths_in_range(tree, a, b, out=None):
+    """
+    Выгружает пути длиной (кол-во ребер) в [a, b] прямо при обходе дерева,
+    без промежуточного плоского массива. Длина общего префикса известна из
+    обхода: это минимальная глубина, до которой откатывался путь с момента
+    записи предыдущего пути, так что сравнивать пути не нужно.
+    Узлы хранят значение в 'val' (bin_tree) или 'value' (остальные задания).
+    """
+    writer = PrefixWriter(out)
+    root = tree.root
+    if root is None:
+        writer.flush()
+        return writer.getvalue()
+
+    attr = 'val' if hasattr(root, 'val') else 'value'
+    path_stack = array('i')
+    pending = []
+    pending_depth = array('i')
+    # Сколько первых узлов пути не менялось с момента последней записи
+    unchanged = 0
+
+    node = root
+    depth = 0
+    while True:
+        path_stack.append(getattr(node, attr))
+        left = node.left
+        right = node.right
+
+        if left is None and right is None:
+            if a <= depth <= b:
+                writer.add_suffix(unchanged, path_stack[unchanged:])
+                unchanged = len(path_stack)
+        elif depth < b:
+            depth += 1
+            if left is not None:
+                if right is not None:
+                    pending.append(right)
+                    pending_depth.append(depth)
+                node = left
+            else:
+                node = right
+            continue
+
+        if not pending:
+            break
+        node = pending.pop()
+        depth = pending_depth.pop()
+        del path_stack[depth:]
+        if depth < unchanged:
+            unchanged = depth
+
+    writer.flush()
+    return writer.getvalue()
+
+
+if __name__ == "__main__":
+    from bin_tree import Tree, Node, find_paths_in_range
+
+    #      1
+    #     / \
+    #    2   3
+    #   / \    \
+    #  4   5    6
+    t = Tree()
+    t.root = Node(1)
+    t.root.left = Node(2)
+    t.root.left.left = Node(4)
+    t.root.left.right = Node(5)
+    t.root.right = Node(3)
+    t.root.right.right = Node(6)
+
+    flat = find_paths_in_range(t, 0, 10)
+    enc = encode_paths_in_range(t, 0, 10)
+    print(f"Плоский формат:  {flat.tolist()}")
+    print(f"С префиксами:    {enc.tolist()}")
+    print(f"Декодируется обратно: {decode_to_flat(enc) == flat}")
+    print(f"encode_flat дает то же: {encode_flat(flat) == enc}")
+
+    print("\n=== Объем на случайном дереве ===")
+    n = 200000
+    t = Tree()
+    for v in range(n):
+        t.insert_random(v)
+
+    start = time.perf_counter()
+    flat = find_paths_in_range(t, 0, n)
+    mid = time.perf_counter()
+    f = io.BytesIO()
+    encode_paths_in_range(t, 0, n, out=f)
+    end = time.perf_counter()
+    print(f"N={n}: плоский {len(flat) * _ITEM / 2**20:.1f} МБ за {mid - start:.3f} сек, "
+          f"с префиксами {f.tell() / 2**20:.1f} МБ за {end - mid:.3f} сек")
+
+    f.seek(0)
+    decoded = array('i')
+    for path in iter_decode_file(f, chunk_items=1000):
+        decoded.append(len(path))
+        decoded.extend(path)
+    print(f"Потоковое декодирование совпадает: {decoded == flat}")
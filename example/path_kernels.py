@@ -0,0 +1,239 @@
+import time
+from array import array
+
+from compact_tree import CompactTree, NIL
+from lazy_paths import LazyPaths
+
+# NumPy ускоряет ядра, но не обязателен: без него работает линейный проход по array
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+# ==========================================
+# 1. Ядро: глубина и префиксная сумма каждого узла
+# ==========================================
+
+def tree_arrays(ct):
+    """
+    Для каждого узла компактного дерева считает родителя, глубину
+    (кол-во ребер от корня) и сумму значений на пути от корня до узла.
+    Возвращает (parent, depth, sums).
+
+    С NumPy дерево обходится по уровням: весь фронт уровня обрабатывается
+    векторными операциями, число шагов интерпретатора - O(высоты).
+    Без NumPy - один линейный проход (дети имеют индексы больше родителя).
+    """
+    if HAS_NUMPY:
+        return _tree_arrays_numpy(ct)
+    return _tree_arrays_python(ct)
+
+
+def _tree_arrays_python(ct):
+    n = len(ct)
+    vals = ct.vals
+    left = ct.left
+    right = ct.right
+    parent = array('i', [NIL]) * n
+    depth = array('i', [0]) * n
+    sums = array('q', [0]) * n
+    if n == 0:
+        return parent, depth, sums
+
+    sums[0] = vals[0]
+    for i in range(n):
+        d = depth[i] + 1
+        s = sums[i]
+        l = left[i]
+        r = right[i]
+        if l != NIL:
+            parent[l] = i
+            depth[l] = d
+            sums[l] = s + vals[l]
+        if r != NIL:
+            parent[r] = i
+            depth[r] = d
+            sums[r] = s + vals[r]
+    return parent, depth, sums
+
+
+def _tree_arrays_numpy(ct):
+    n = len(ct)
+    # Буферы array отображаются в NumPy без копирования
+    vals = np.frombuffer(ct.vals, dtype=ct.typecode).astype(np.int64)
+    left = np.frombuffer(ct.left, dtype=ct.left.typecode)
+    right = np.frombuffer(ct.right, dtype=ct.right.typecode)
+    parent = np.full(n, NIL, dtype=np.int32)
+    depth = np.zeros(n, dtype=np.int32)
+    sums = np.zeros(n, dtype=np.int64)
+    if n == 0:
+        return parent, depth, sums
+
+    sums[0] = vals[0]
+    frontier = np.zeros(1, dtype=np.intp)
+    while frontier.size:
+        next_level = []
+        for children in (left, right):
+            child = children[frontier]
+            has_child = child != NIL
+            child = child[has_child]
+            par = frontier[has_child]
+            parent[child] = par
+            depth[child] = depth[par] + 1
+            sums[child] = sums[par] + vals[child]
+            next_level.append(child)
+        frontier = np.concatenate(next_level).astype(np.intp)
+    return parent, depth, sums
+
+
+# ==========================================
+# 2. Отбор листьев по маске
+# ==========================================
+
+def select_leaves(ct, min_depth=None, max_depth=None, min_sum=None, max_sum=None,
+                  outside=False):
+    """
+    Возвращает LazyPaths: индексы листьев, прошедших фильтр (в порядке
+    индексов, для from_tree это порядок обхода слева направо), и массив
+    родителей - пути восстанавливаются только по требованию.
+
+    Фильтр: глубина в [min_depth, max_depth] и сумма в [min_sum, max_sum]
+    (None - граница не задана). outside=True инвертирует условие по глубине,
+    как в get_paths_outside_range из Exam.
+    """
+    parent, depth, sums = tree_arrays(ct)
+    if HAS_NUMPY:
+        left = np.frombuffer(ct.left, dtype=ct.left.typecode)
+        right = np.frombuffer(ct.right, dtype=ct.right.typecode)
+        depth_ok = np.ones(len(ct), dtype=bool)
+        if min_depth is not None:
+            depth_ok &= depth >= min_depth
+        if max_depth is not None:
+            depth_ok &= depth <= max_depth
+        if outside:
+            depth_ok = ~depth_ok
+        mask = (left == NIL) & (right == NIL) & depth_ok
+        if min_sum is not None:
+            mask &= sums >= min_sum
+        if max_sum is not None:
+            mask &= sums <= max_sum
+        leaves = array('i', np.flatnonzero(mask).astype(np.int32).tobytes())
+        return LazyPaths(ct.vals, array('i', parent.tobytes()), leaves)
+
+    lo_d = -1 if min_depth is None else min_depth
+    hi_d = len(ct) if max_depth is None else max_depth
+    left = ct.left
+    right = ct.right
+    leaves = array('i')
+    for i in range(len(ct)):
+        if left[i] != NIL or right[i] != NIL:
+            continue
+        if (lo_d <= depth[i] <= hi_d) == outside:
+            continue
+        s = sums[i]
+        if (min_sum is not None and s < min_sum) or (max_sum is not None and s > max_sum):
+            continue
+        leaves.append(i)
+    return LazyPaths(ct.vals, parent, leaves)
+
+
+# ==========================================
+# 3. Запросы путей поверх ядра (результат - LazyPaths)
+# ==========================================
+
+def find_paths_in_range(ct, a, b):
+    """Пути длиной (кол-во ребер) в [a, b] - как в bin_tree."""
+    return select_leaves(ct, min_depth=a, max_depth=b)
+
+
+def get_paths_outside_range(ct, a, b):
+    """Пути с количеством узлов < a или > b - как в Exam/Task1.1.py."""
+    # Кол-во узлов = ребра + 1
+    return select_leaves(ct, min_depth=a - 1, max_depth=b - 1, outside=True)
+
+
+def find_paths_by_sum(ct, a, b):
+    """Пути с суммой значений в [a, b] - как Tree.find_paths_in_range в 338818."""
+    return select_leaves(ct, min_sum=a, max_sum=b)
+
+
+def find_paths_with_sum(ct, target):
+    """Пути с суммой, равной target - как в 338825."""
+    return find_paths_by_sum(ct, target, target)
+
+
+# ==========================================
+# 4. Сравнение с рекурсивным обходом
+# ==========================================
+
+def _recursive_sum_paths(ct, a, b):
+    """Эталон: рекурсивный поиск по сумме в стиле 338818 (для сравнения)."""
+    vals = ct.vals
+    left = ct.left
+    right = ct.right
+    results = []
+    path = array('l')
+
+    def dfs(i, s):
+        s += vals[i]
+        path.append(vals[i])
+        if left[i] == NIL and right[i] == NIL:
+            if a <= s <= b:
+                results.append(array('l', path))
+        else:
+            if left[i] != NIL:
+                dfs(left[i], s)
+            if right[i] != NIL:
+                dfs(right[i], s)
+        path.pop()
+
+    if len(ct):
+        dfs(0, 0)
+    return results
+
+
+if __name__ == "__main__":
+    import random
+    import sys
+    sys.setrecursionlimit(20000)
+
+    print(f"NumPy доступен: {HAS_NUMPY}")
+
+    # Дерево из теста 338818:  5 / (3 / 2), (8 / 1, 4)
+    ct = CompactTree()
+    r = ct.add_node(5)
+    l = ct.add_node(3, r, True)
+    ct.add_node(2, l, True)
+    rr = ct.add_node(8, r, False)
+    ct.add_node(1, rr, True)
+    ct.add_node(4, rr, False)
+    print(f"Сумма в [9, 15]: {find_paths_by_sum(ct, 9, 15).flat().tolist()}")  # [5,3,2], [5,8,1]
+    print(f"Длина в [2, 2]: {find_paths_in_range(ct, 2, 2).flat().tolist()}")
+    print(f"Узлов вне [1, 2]: {get_paths_outside_range(ct, 1, 2).flat().tolist()}")
+
+    print("\n=== Бенчмарк: почти ничего не подходит (a, b = 1000000, 1000001) ===")
+    a, b = 1000000, 1000001
+    for n in (10000, 50000, 200000):
+        ct = CompactTree()
+        ct.add_node(random.randint(-100, 100))
+        # Свободные места для детей: 2 * индекс + (0 - левый, 1 - правый).
+        # Случайное место удаляем обменом с последним - построение за O(N).
+        free = array('l', (0, 1))
+        for i in range(1, n):
+            j = random.randrange(len(free))
+            slot = free[j]
+            free[j] = free[-1]
+            free.pop()
+            idx = ct.add_node(random.randint(-100, 100), slot >> 1, not slot & 1)
+            free.append(2 * idx)
+            free.append(2 * idx + 1)
+
+        start = time.perf_counter()
+        expected = _recursive_sum_paths(ct, a, b)
+        mid = time.perf_counter()
+        got = find_paths_by_sum(ct, a, b)
+        end = time.perf_counter()
+        assert len(got) == len(expected)
+        print(f"N={n}: рекурсия {mid - start:.4f} сек, ядро {end - mid:.4f} сек")
@@ -0,0 +1,260 @@
+import sys
+import time
+from array import array
+
+from compact_tree import CompactTree, NIL, buffer_typecode
+
+
+def iter_paths(tree, min_len=None, max_len=None, min_sum=None, max_sum=None,
+               copy=False, typecode=None, details=False):
+    """
+    Единый потоковый поиск путей от корня до листа.
+
+    Условие: длина (кол-во ребер) в [min_len, max_len] и сумма значений
+    в [min_sum, max_sum]; None - граница не задана. Подходит для Tree/Node
+    любого задания (поле 'val' или 'value') и для CompactTree.
+
+    Обход итеративный, путь yield-ится без копирования: отдается сам
+    рабочий array, поэтому стоимость выдачи пути не зависит от глубины,
+    а память - O(высоты). Массив действителен только до следующей итерации
+    и не должен изменяться; чтобы сохранить путь, скопируйте его или
+    передайте copy=True. Генератор можно прервать в любой момент -
+    дальше дерево не обходится.
+
+    typecode - тип массива пути (по умолчанию 'l', у CompactTree - его
+    typecode). details=True - вместо пути выдаются тройки (путь, сумма,
+    kept): первые kept значений пути не менялись с предыдущей выдачи,
+    поэтому сохраненную копию можно обновлять только с позиции kept.
+    """
+    if isinstance(tree, CompactTree):
+        if len(tree):
+            yield from iter_subtree_paths(tree, 0, (), min_len, max_len, min_sum,
+                                          max_sum, copy, typecode, details)
+        return
+
+    root = tree.root if hasattr(tree, 'root') else tree
+    if root is None:
+        return
+    attr = 'val' if hasattr(root, 'val') else 'value'
+    typecode = typecode or 'l'
+    lo_len = 0 if min_len is None else min_len
+    hi_len = sys.maxsize if max_len is None else max_len
+    check_sum = min_sum is not None or max_sum is not None
+    # Сумма пути нужна только для условия по сумме и для details
+    track_sum = check_sum or details
+
+    path = array(typecode)
+    # Отложенные правые ветки: узел, глубина, сумма пути до родителя
+    pending = []
+    pending_depth = array('l')
+    pending_sum = []
+    # Длина неизменного с прошлой выдачи префикса (для details)
+    kept = 0
+
+    node = root
+    depth = 0
+    s = 0
+    while True:
+        val = getattr(node, attr)
+        path.append(val)
+        if track_sum:
+            s += val
+        left = node.left
+        right = node.right
+
+        if left is None and right is None:
+            if lo_len <= depth <= hi_len and (
+                    not check_sum or ((min_sum is None or s >= min_sum) and
+                                      (max_sum is None or s <= max_sum))):
+                found = array(typecode, path) if copy else path
+                if details:
+                    yield found, s, kept
+                    kept = depth + 1
+                else:
+                    yield found
+        elif depth < hi_len:
+            # Поддеревья глубже max_len не обходим
+            depth += 1
+            if left is not None:
+                if right is not None:
+                    pending.append(right)
+                    pending_depth.append(depth)
+                    pending_sum.append(s)
+                node = left
+            else:
+                node = right
+            continue
+
+        if not pending:
+            return
+        node = pending.pop()
+        depth = pending_depth.pop()
+        s = pending_sum.pop()
+        del path[depth:]
+        if depth < kept:
+            kept = depth
+
+
+def iter_subtree_paths(ct, root, prefix=(), min_len=None, max_len=None, min_sum=None,
+                       max_sum=None, copy=False, typecode=None, details=False):
+    """
+    То же, что iter_paths для CompactTree, но для поддерева с корнем root:
+    prefix - значения предков root, они входят в каждый путь, а длина и
+    сумма считаются от корня всего дерева. Буферы ct могут быть и
+    memoryview (дерево из tree_io или общей памяти).
+    """
+    vals = ct.vals
+    left = ct.left
+    right = ct.right
+    typecode = typecode or buffer_typecode(vals)
+    lo_len = 0 if min_len is None else min_len
+    hi_len = sys.maxsize if max_len is None else max_len
+    check_sum = min_sum is not None or max_sum is not None
+    track_sum = check_sum or details
+
+    path = array(typecode, prefix)
+    pending = array('l')
+    pending_depth = array('l')
+    pending_sum = []
+    kept = 0
+
+    i = root
+    depth = len(prefix)
+    s = sum(prefix)
+    while True:
+        val = vals[i]
+        path.append(val)
+        if track_sum:
+            s += val
+        l = left[i]
+        r = right[i]
+
+        if l == NIL and r == NIL:
+            if lo_len <= depth <= hi_len and (
+                    not check_sum or ((min_sum is None or s >= min_sum) and
+                                      (max_sum is None or s <= max_sum))):
+                found = array(typecode, path) if copy else path
+                if details:
+                    yield found, s, kept
+                    kept = depth + 1
+                else:
+                    yield found
+        elif depth < hi_len:
+            depth += 1
+            if l != NIL:
+                if r != NIL:
+                    pending.append(r)
+                    pending_depth.append(depth)
+                    pending_sum.append(s)
+                i = l
+            else:
+                i = r
+            continue
+
+        if not pending:
+            return
+        i = pending.pop()
+        depth = pending_depth.pop()
+        s = pending_sum.pop()
+        del path[depth:]
+        if depth < kept:
+            kept = depth
+
+
+def min_max_paths(paths):
+    """
+    Пути с минимальной и максимальной суммой из потока iter_paths(...,
+    details=True): (min_sum, min_path, max_sum, max_path), при равных
+    суммах остается первый путь; у пустого потока - четыре None.
+    valid_min/valid_max - длина общего префикса текущего пути и
+    сохраненного лучшего: он только укорачивается (до kept), а при
+    улучшении дописывается лишь хвост после него. Поэтому копирование
+    суммарно O(N), а памяти - O(H), без массивов на все узлы.
+    """
+    min_sum = max_sum = None
+    min_path = max_path = None
+    valid_min = valid_max = 0
+    for path, s, kept in paths:
+        if min_path is None:
+            min_path = array(path.typecode)
+            max_path = array(path.typecode)
+        if valid_max > kept:
+            valid_max = kept
+        if valid_min > kept:
+            valid_min = kept
+        # Строгие сравнения: при равенстве остается левый лист
+        if max_sum is None or s > max_sum:
+            max_sum = s
+            del max_path[valid_max:]
+            max_path.extend(path[valid_max:])
+            valid_max = len(path)
+        if min_sum is None or s < min_sum:
+            min_sum = s
+            del min_path[valid_min:]
+            min_path.extend(path[valid_min:])
+            valid_min = len(path)
+    return min_sum, min_path, max_sum, max_path
+
+
+# Частные случаи прежних функций поиска путей
+
+def iter_paths_in_range(tree, a, b):
+    """Длина (кол-во ребер) в [a, b] - как bin_tree.find_paths_in_range."""
+    return iter_paths(tree, min_len=a, max_len=b)
+
+
+def iter_paths_by_sum(tree, a, b):
+    """Сумма в [a, b] - как Tree.find_paths_in_range в 338818."""
+    return iter_paths(tree, min_sum=a, max_sum=b)
+
+
+def iter_paths_with_sum(tree, target):
+    """Сумма равна target - как Tree.find_paths_with_sum в 338825."""
+    return iter_paths(tree, min_sum=target, max_sum=target)
+
+
+if __name__ == "__main__":
+    from bin_tree import Tree, Node, find_paths_in_range
+
+    #       5
+    #      / \
+    #     3   8
+    #    /   / \
+    #   2   1   4
+    t = Tree()
+    t.root = Node(5)
+    t.root.left = Node(3)
+    t.root.left.left = Node(2)
+    t.root.right = Node(8)
+    t.root.right.left = Node(1)
+    t.root.right.right = Node(4)
+
+    print("Сумма в [9, 15]:", [p.tolist() for p in iter_paths_by_sum(t, 9, 15)])
+    print("Длина 2 и сумма > 12:", [p.tolist() for p in iter_paths(t, 2, 2, min_sum=13)])
+    first = next(iter_paths_in_range(t, 0, 10))
+    print("Первый путь (ранняя остановка):", first.tolist())
+
+    print("\n=== Вырожденное дерево (линия) из 1 000 000 узлов ===")
+    line = Tree()
+    line.root = Node(0)
+    curr = line.root
+    for v in range(1, 1000000):
+        curr.right = Node(v)
+        curr = curr.right
+    start = time.perf_counter()
+    total = 0
+    for p in iter_paths_in_range(line, 0, 10**7):
+        total += len(p)
+    print(f"Узлов в путях: {total}, время {time.perf_counter() - start:.3f} сек")
+
+    print("\n=== Широкое дерево: выдача пути без копирования ===")
+    n = 200000
+    t = Tree()
+    for v in range(n):
+        t.insert_random(v)
+    for copy in (True, False):
+        start = time.perf_counter()
+        count = 0
+        for p in iter_paths(t, copy=copy):
+            count += 1
+        print(f"copy={copy}: путей {count}, время {time.perf_counter() - start:.3f} сек")
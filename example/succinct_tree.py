@@ -0,0 +1,279 @@
+import time
+from array import array
+from bisect import bisect_left
+
+from compact_tree import CompactTree, NIL
+
+# Слов по 64 бита в блоке справочника рангов: 8 байт счетчика на 512 бит
+# структуры, т.е. 0.25 бита на узел сверх 2 битов самой структуры
+_BLOCK_WORDS = 8
+
+
+class SuccinctTree:
+    """
+    Бинарное дерево в представлении LOUDS: узлы нумеруются по уровням
+    (корень - 0), у узла p в битовом векторе два бита: 2p - есть левый
+    ребенок, 2p+1 - есть правый. k-я единица (с 1) соответствует узлу k,
+    поэтому навигация сводится к rank/select:
+        ребенок в бите q:  rank1(q) + 1   (единиц до бита q, плюс корень)
+        родитель узла j:   select1(j) // 2
+    Структура - 2 бита на узел плюс справочник rank по блокам 512 бит
+    (popcount через int.bit_count); значения - отдельный массив по уровням.
+    Только для чтения: изменения - через CompactTree и повторную сборку.
+    """
+    __slots__ = ('vals', 'words', 'ranks', 'n')
+
+    def __init__(self, typecode='i'):
+        self.vals = array(typecode)
+        self.words = array('Q')
+        self.ranks = array('q', (0,))
+        self.n = 0
+
+    def __len__(self):
+        return self.n
+
+    @classmethod
+    def from_tree(cls, tree, typecode='i'):
+        """Строит из Tree (любого задания) или CompactTree обходом в ширину."""
+        ct = tree if isinstance(tree, CompactTree) else CompactTree.from_tree(tree, typecode)
+        st = cls(typecode if ct is not tree else ct.typecode)
+        n = len(ct)
+        st.n = n
+        if not n:
+            return st
+        vals = ct.vals
+        left = ct.left
+        right = ct.right
+
+        words = array('Q', [0]) * ((2 * n + 63) // 64)
+        out_vals = st.vals
+        # Очередь уровня - сам массив порядка обхода, голова - индекс в нем
+        order = array('i', (0,))
+        head = 0
+        while head < len(order):
+            i = order[head]
+            out_vals.append(vals[i])
+            bit = 2 * head
+            if left[i] != NIL:
+                words[bit >> 6] |= 1 << (bit & 63)
+                order.append(left[i])
+            bit += 1
+            if right[i] != NIL:
+                words[bit >> 6] |= 1 << (bit & 63)
+                order.append(right[i])
+            head += 1
+
+        ranks = array('q', [0]) * ((len(words) + _BLOCK_WORDS - 1) // _BLOCK_WORDS + 1)
+        total = 0
+        for w in range(len(words)):
+            if w % _BLOCK_WORDS == 0:
+                ranks[w // _BLOCK_WORDS] = total
+            total += words[w].bit_count()
+        ranks[-1] = total
+        st.words = words
+        st.ranks = ranks
+        return st
+
+    def nbytes(self):
+        """(байты значений, байты структуры вместе со справочником rank)."""
+        return (len(self.vals) * self.vals.itemsize,
+                len(self.words) * 8 + len(self.ranks) * 8)
+
+    # --- rank / select ---
+
+    def bit(self, i):
+        return (self.words[i >> 6] >> (i & 63)) & 1
+
+    def rank1(self, i):
+        """Количество единиц в битах [0, i)."""
+        words = self.words
+        w = i >> 6
+        block = w // _BLOCK_WORDS
+        r = self.ranks[block]
+        for k in range(block * _BLOCK_WORDS, w):
+            r += words[k].bit_count()
+        if i & 63:
+            r += (words[w] & ((1 << (i & 63)) - 1)).bit_count()
+        return r
+
+    def select1(self, j):
+        """Позиция j-й единицы (j с 1): бинарный поиск по блокам, затем по словам."""
+        ranks = self.ranks
+        words = self.words
+        block = bisect_left(ranks, j) - 1
+        j -= ranks[block]
+        w = block * _BLOCK_WORDS
+        while True:
+            c = words[w].bit_count()
+            if j <= c:
+                break
+            j -= c
+            w += 1
+        word = words[w]
+        for _ in range(j - 1):
+            word &= word - 1
+        return (w << 6) + (word & -word).bit_length() - 1
+
+    # --- Навигация ---
+
+    def children(self, p):
+        """(левый, правый) ребенок узла p или NIL - один rank на оба."""
+        bits = (self.words[(2 * p) >> 6] >> ((2 * p) & 63)) & 3
+        if not bits:
+            return NIL, NIL
+        first = self.rank1(2 * p) + 1
+        if bits == 3:
+            return first, first + 1
+        return (first, NIL) if bits == 1 else (NIL, first)
+
+    def left(self, p):
+        return self.children(p)[0]
+
+    def right(self, p):
+        return self.children(p)[1]
+
+    def is_leaf(self, p):
+        return not (self.words[(2 * p) >> 6] >> ((2 * p) & 63)) & 3
+
+    def parent(self, j):
+        return NIL if j == 0 else self.select1(j) >> 1
+
+
+# ==========================================
+# Запросы поверх структуры в 2 бита на узел
+# ==========================================
+
+def find_paths_in_range(st, a, b):
+    """
+    Аналог bin_tree.find_paths_in_range (тот же формат и порядок путей):
+    пути от корня до листа длиной (кол-во ребер) от a до b.
+    """
+    results = array(st.vals.typecode)
+    if not len(st):
+        return results
+    vals = st.vals
+    children = st.children
+    path_stack = array(st.vals.typecode)
+    pending = array('l')
+    pending_depth = array('i')
+
+    i = 0
+    depth = 0
+    while True:
+        path_stack.append(vals[i])
+        l, r = children(i)
+        if l == NIL and r == NIL:
+            if a <= depth <= b:
+                results.append(depth + 1)
+                results.extend(path_stack)
+        elif depth < b:
+            depth += 1
+            if l != NIL:
+                if r != NIL:
+                    pending.append(r)
+                    pending_depth.append(depth)
+                i = l
+            else:
+                i = r
+            continue
+        if not pending:
+            break
+        i = pending.pop()
+        depth = pending_depth.pop()
+        del path_stack[depth:]
+    return results
+
+
+def is_symmetric(st):
+    """Симметрично ли дерево по значениям относительно корня."""
+    if not len(st):
+        return True
+    vals = st.vals
+    children = st.children
+    pairs = array('l', children(0))
+    while pairs:
+        j = pairs.pop()
+        i = pairs.pop()
+        if i == NIL and j == NIL:
+            continue
+        if i == NIL or j == NIL or vals[i] != vals[j]:
+            return False
+        il, ir = children(i)
+        jl, jr = children(j)
+        pairs.append(il)
+        pairs.append(jr)
+        pairs.append(ir)
+        pairs.append(jl)
+    return True
+
+
+def height(st):
+    """Высота (кол-во уровней): глубина последнего по уровням узла."""
+    h = 0
+    j = len(st) - 1
+    while j != NIL:
+        h += 1
+        j = st.parent(j)
+    return h
+
+
+def validate_heap(st, A, B):
+    """
+    Аналог Tree.validate_heap из 3388XX/task2.2: (is_heap, type, height).
+    В LOUDS полнота видна по битам: у полного дерева первые n-1 бит -
+    единицы, а номер узла по уровням совпадает с индексом в куче, поэтому
+    родитель узла j - это (j - 1) // 2 без всякой навигации.
+    """
+    n = len(st)
+    if not n:
+        return False, None, 0
+    h = height(st)
+    if st.rank1(n - 1) != n - 1:
+        return False, None, h
+
+    vals = st.vals
+    is_min = is_max = True
+    for j in range(1, n):
+        v = vals[j]
+        p = vals[(j - 1) >> 1]
+        if v < p:
+            is_min = False
+        elif v > p:
+            is_max = False
+        if not (is_min or is_max):
+            break
+    is_heap = (is_min or is_max) and A < h < B
+    heap_type = None
+    if is_heap:
+        heap_type = "Min-Heap" if is_min else "Max-Heap"
+    return is_heap, heap_type, h
+
+
+if __name__ == "__main__":
+    from compact_tree import find_paths_in_range as find_paths_compact
+    from compact_tree import is_symmetric as is_symmetric_compact
+    from tree_builders import build_tree
+
+    for n in (100000, 1000000):
+        ct = build_tree(n, 'random', seed=1, compact=True)
+        start = time.perf_counter()
+        st = SuccinctTree.from_tree(ct)
+        build_time = time.perf_counter() - start
+        val_bytes, struct_bytes = st.nbytes()
+        print(f"N={n}: структура {struct_bytes * 8 / n:.2f} бит/узел "
+              f"(CompactTree: {(len(ct.left) + len(ct.right)) * 32 / n:.0f}), "
+              f"сборка {build_time:.3f} сек")
+
+        start = time.perf_counter()
+        expected = find_paths_compact(ct, 0, n)
+        mid = time.perf_counter()
+        got = find_paths_in_range(st, 0, n)
+        end = time.perf_counter()
+        print(f"    пути совпадают: {got == expected}, CompactTree {mid - start:.3f} сек, "
+              f"LOUDS {end - mid:.3f} сек")
+
+    heap = SuccinctTree.from_tree(build_tree(1023, 'complete', values=range(1023), compact=True))
+    print(f"Полное дерево 0..1022: {validate_heap(heap, 0, 100)}")
+    mirror = SuccinctTree.from_tree(build_tree(15, 'complete', values=[1] * 15, compact=True))
+    print(f"Симметрично: {is_symmetric(mirror)} (CompactTree: "
+          f"{is_symmetric_compact(build_tree(15, 'complete', values=[1] * 15, compact=True))})")
@@ -4,6 +4,10 @@ import random
 import math
 from array import array
 
+from compact_tree import CompactTree, count_builds
+from path_stream import iter_paths
+from compact_tree import check_tree_properties as compact_check_tree_properties
+
 # Если вы хотите график, убедитесь, что библиотека установлена: pip install matplotlib
 try:
     import matplotlib.pyplot as plt
@@ -57,30 +61,13 @@ def find_paths_in_range(tree, a, b):
     """
     Находит пути от корня до листа длиной [a, b].
     Возвращает array('i') в формате: [len1, val1, val2..., len2, val1...]
+    Обход - общий итеративный path_stream.iter_paths, глубина дерева не
+    ограничена лимитом рекурсии.
     """
     results = array('i')
-    path_stack = array('i')
-    
-    if tree.root is None:
-        return results
-
-    def _dfs(node, current_length):
-        path_stack.append(node.val)
-        
-        # Если лист
-        if node.left is None and node.right is None:
-            if a <= current_length <= b:
-                results.append(len(path_stack))
-                results.extend(path_stack)
-        else:
-            if node.left:
-                _dfs(node.left, current_length + 1)
-            if node.right:
-                _dfs(node.right, current_length + 1)
-        
-        path_stack.pop()
-
-    _dfs(tree.root, 0)
+    for path in iter_paths(tree, a, b, typecode='i'):
+        results.append(len(path))
+        results.extend(path)
     return results
 
 def print_paths_result(results_array):
@@ -110,6 +97,17 @@ def check_tree_properties(tree, A, B, c, d):
     1. Линейный список с диапазоном значений [c, d].
     2. АВЛ-дерево с высотой (A, B).
     Возвращает (is_linear, is_avl)
+
+    Дерево раскладывается в CompactTree (typecode выбирается по значениям,
+    float тоже подходят), проход снизу вверх - compact_tree.summarize:
+    результаты узлов лежат в массивах, а не в кортеже на каждый узел.
+    """
+    return compact_check_tree_properties(CompactTree.from_tree(tree, None), A, B, c, d)
+
+def check_tree_properties_recursive(tree, A, B, c, d):
+    """
+    Прежняя рекурсивная версия (кортеж на узел) - для сравнения в
+    benchmark_analyzers.
     """
     INF = float('inf')
     N_INF = float('-inf')
@@ -152,6 +150,51 @@ def check_tree_properties(tree, A, B, c, d):
 # 4. ТЕСТИРОВАНИЕ И ГРАФИК
 # ==========================================
 
+def benchmark_analyzers(n=200000, traced_n=2000):
+    """
+    Рекурсивная и массивная версии check_tree_properties: время на n узлах
+    и число собранных кортежей/списков (count_builds) на traced_n узлах.
+    """
+    print(f"\n--- Анализаторы свойств, N={n} ---")
+    for size in (n, traced_n):
+        t = _bst_complete_tree(size)
+        for name, func in (("кортежи (рекурсия)", check_tree_properties_recursive),
+                           ("массивы", check_tree_properties)):
+            if size == n:
+                start = time.perf_counter()
+                result = func(t, 1, 100, 0, n)
+                elapsed = time.perf_counter() - start
+                print(f"{name:<20} {result}: {elapsed:.4f} сек")
+            else:
+                _, builds = count_builds(func, t, 1, 100, 0, n)
+                print(f"{name:<20} N={size}: BUILD_* {builds} "
+                      f"({builds / size:.2f} на узел)")
+
+def _bst_complete_tree(n):
+    """Полное дерево, значения в порядке BST - обе проверки идут до корня."""
+    t = Tree()
+    nodes = [Node(0) for _ in range(n)]
+    for i in range(n):
+        if 2 * i + 1 < n:
+            nodes[i].left = nodes[2 * i + 1]
+        if 2 * i + 2 < n:
+            nodes[i].right = nodes[2 * i + 2]
+    t.root = nodes[0]
+    stack = [(t.root, False)]
+    counter = 0
+    while stack:
+        node, done = stack.pop()
+        if node is None:
+            continue
+        if done:
+            node.val = counter
+            counter += 1
+            continue
+        stack.append((node.right, False))
+        stack.append((node, True))
+        stack.append((node.left, False))
+    return t
+
 def performance_graph():
     if not HAS_MATPLOTLIB:
         return
@@ -232,6 +275,8 @@ def main():
     is_lin2, is_avl2 = check_tree_properties(t_avl, A=1, B=5, c=0, d=10)
     print(f"\nДерево (1<-2->3). \n -> Линейное [0,10]? {is_lin2} \n -> АВЛ (1<H<5)? {is_avl2}")
 
+    benchmark_analyzers()
+
     # Запуск теста производительности
     performance_graph()
 
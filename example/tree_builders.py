@@ -0,0 +1,177 @@
+import time
+import random
+from array import array
+
+from compact_tree import CompactTree, NIL
+
+SHAPES = ('random', 'balanced', 'degenerate', 'complete', 'bst')
+
+
+def build_tree(n, shape='random', seed=None, values=None, lo=-100, hi=100,
+               compact=False, tree_cls=None, node_cls=None):
+    """
+    Строит дерево из n узлов заданной формы за O(N):
+      'random'     - случайное: каждый новый узел занимает случайное
+                     свободное место (без повторных попыток);
+      'balanced'   - сбалансированное по высоте;
+      'degenerate' - линия (цепочка правых детей);
+      'complete'   - полное (как куча: дети узла i - 2i+1 и 2i+2);
+      'bst'        - сбалансированное дерево поиска из отсортированных значений.
+
+    values - значения узлов (n штук), иначе случайные целые в [lo, hi].
+    seed делает результат воспроизводимым. compact=True возвращает
+    CompactTree (прямой порядок нумерации, как у from_tree), иначе - Tree
+    из tree_cls/node_cls (по умолчанию bin_tree).
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Неизвестная форма дерева: {shape}")
+    rng = random.Random(seed)
+    if values is None:
+        vals = array('i', rng.choices(range(lo, hi + 1), k=n))
+    else:
+        vals = array('i', values)
+        if len(vals) != n:
+            raise ValueError("Количество значений должно быть равно n")
+    if shape == 'bst':
+        vals = array('i', sorted(vals))
+
+    if shape == 'random':
+        ct = _random_shape(vals, rng)
+    elif shape == 'degenerate':
+        ct = _degenerate_shape(vals)
+    elif shape == 'complete':
+        ct = _complete_shape(vals)
+    else:
+        ct = _balanced_shape(vals, in_order=(shape == 'bst'))
+
+    if compact:
+        return ct
+    return ct.to_tree(tree_cls, node_cls)
+
+
+def _random_shape(vals, rng):
+    """
+    Свободные места для детей хранятся как 2 * индекс + (0 - левый,
+    1 - правый). Случайное место удаляется обменом с последним - O(1) на
+    узел, без выбора занятых родителей и повторов, как в generate_random_tree.
+    """
+    n = len(vals)
+    ct = CompactTree()
+    if n == 0:
+        return ct
+    left = array('i', [NIL]) * n
+    right = array('i', [NIL]) * n
+    free = array('l', (0, 1))
+    randbelow = rng.randrange
+    for idx in range(1, n):
+        j = randbelow(len(free))
+        slot = free[j]
+        free[j] = free[-1]
+        free.pop()
+        if slot & 1:
+            right[slot >> 1] = idx
+        else:
+            left[slot >> 1] = idx
+        free.append(2 * idx)
+        free.append(2 * idx + 1)
+    ct.vals = vals
+    ct.left = left
+    ct.right = right
+    # Узлы нумеровались в порядке вставки - приводим к прямому порядку
+    return ct.to_preorder()
+
+
+def _degenerate_shape(vals):
+    n = len(vals)
+    ct = CompactTree()
+    if n == 0:
+        return ct
+    ct.vals = vals
+    ct.left = array('i', [NIL]) * n
+    ct.right = array('i', range(1, n + 1))
+    ct.right[n - 1] = NIL
+    return ct
+
+
+def _complete_shape(vals):
+    # Нумерация кучи (по уровням) приводится к прямому порядку
+    n = len(vals)
+    ct = CompactTree()
+    if n == 0:
+        return ct
+    left = array('i', range(1, 2 * n, 2))
+    right = array('i', range(2, 2 * n + 1, 2))
+    # Дети существуют только у первых (n - 1) // 2 или n // 2 узлов
+    no_left = n // 2
+    no_right = (n - 1) // 2
+    left[no_left:] = array('i', [NIL]) * (n - no_left)
+    right[no_right:] = array('i', [NIL]) * (n - no_right)
+    ct.vals = vals
+    ct.left = left
+    ct.right = right
+    return ct.to_preorder()
+
+
+def _balanced_shape(vals, in_order):
+    """
+    Сбалансированное дерево строится сразу в прямом порядке: отрезок
+    [lo, hi] делится пополам, середина становится корнем отрезка.
+    in_order=True берет значение середины (дерево поиска из отсортированных
+    значений), иначе значения раздаются по порядку создания узлов.
+    """
+    n = len(vals)
+    ct = CompactTree()
+    if n == 0:
+        return ct
+    node_vals = array('i', [0]) * n
+    left = array('i', [NIL]) * n
+    right = array('i', [NIL]) * n
+
+    # Стек отрезков: границы и место для подвешивания (-1 у корня)
+    stack_lo = array('l', (0,))
+    stack_hi = array('l', (n - 1,))
+    stack_slot = array('l', (-1,))
+    idx = 0
+    while stack_lo:
+        lo = stack_lo.pop()
+        hi = stack_hi.pop()
+        slot = stack_slot.pop()
+        mid = (lo + hi) // 2
+        node_vals[idx] = vals[mid] if in_order else vals[idx]
+        if slot >= 0:
+            if slot & 1:
+                right[slot >> 1] = idx
+            else:
+                left[slot >> 1] = idx
+        if mid < hi:
+            stack_lo.append(mid + 1)
+            stack_hi.append(hi)
+            stack_slot.append(2 * idx + 1)
+        if lo < mid:
+            stack_lo.append(lo)
+            stack_hi.append(mid - 1)
+            stack_slot.append(2 * idx)
+        idx += 1
+
+    ct.vals = node_vals
+    ct.left = left
+    ct.right = right
+    return ct
+
+
+if __name__ == "__main__":
+    from compact_tree import check_tree_properties
+
+    small = build_tree(7, 'bst', values=range(7), compact=True)
+    print(f"BST из 0..6: vals={small.vals.tolist()}")
+    print(f"(линейный, АВЛ) = {check_tree_properties(small, 0, 10, 0, 10)}")
+    same = build_tree(1000, 'random', seed=42, compact=True)
+    again = build_tree(1000, 'random', seed=42, compact=True)
+    print(f"Один seed - одно дерево: {same.vals == again.vals and same.left == again.left}")
+
+    print("\n=== Скорость построения (CompactTree) ===")
+    for shape in SHAPES:
+        for n in (100000, 1000000):
+            start = time.perf_counter()
+            build_tree(n, shape, seed=1, compact=True)
+            print(f"{shape:<11} N={n:<8} {time.perf_counter() - start:.3f} сек")
@@ -0,0 +1,234 @@
+import io
+import mmap
+import struct
+import sys
+import time
+from array import array
+
+from compact_tree import CompactTree, NIL
+
+# Формат файла (все числа - little-endian на любой платформе):
+#   заголовок (_HEADER): сигнатура, версия, typecode значений, флаги, N,
+#                        смещение массива значений, смещение индексов
+#                        детей (0 - их нет);
+#   структура: 2 бита на узел в прямом порядке (бит 0 - есть левый
+#              ребенок, бит 1 - есть правый), 4 узла в байте;
+#   значения: N значений в прямом порядке, как лежат в array(typecode),
+#             с выравниванием на 8 байт - их можно отдать как memoryview;
+#   индексы (флаг INDEXED): left и right по N значений array('i') -
+#             load_tree отдает их как memoryview, без разбора структуры.
+MAGIC = b'BTRE'
+VERSION = 2
+INDEXED = 1
+_HEADER = struct.Struct('<4sBcBxQQQ')
+_ALIGN = 8
+# Узлов в одном куске при записи (кратно 4 - целые байты структуры)
+_CHUNK_NODES = 1 << 16
+# На big-endian машине буферы переставляются при записи и чтении
+_SWAP = sys.byteorder == 'big'
+
+# Коды 4 узлов, упакованных в один байт
+_UNPACK = [(b & 3, (b >> 2) & 3, (b >> 4) & 3, b >> 6) for b in range(256)]
+
+
+def _as_preorder(tree, typecode):
+    if isinstance(tree, CompactTree):
+        return tree.to_preorder()
+    return CompactTree.from_tree(tree, typecode)
+
+
+def _write_buffer(f, buf, typecode):
+    """Пишет array/memoryview в little-endian: кусками, без копии целиком."""
+    if not _SWAP:
+        if isinstance(buf, array):
+            buf.tofile(f)
+        else:
+            # memoryview из load_tree
+            f.write(buf)
+        return
+    for start in range(0, len(buf), _CHUNK_NODES):
+        chunk = array(typecode, buf[start:start + _CHUNK_NODES])
+        chunk.byteswap()
+        chunk.tofile(f)
+
+
+def _write(f, ct, indexed):
+    """
+    Пишет дерево в прямом порядке в файловый объект f, возвращает размер.
+    Структура кодируется кусками по _CHUNK_NODES узлов, значения и индексы
+    пишутся прямо из буферов - целиком файл в памяти не собирается.
+    """
+    n = len(ct)
+    values_offset = _HEADER.size + (n + 3) // 4
+    padding = -values_offset % _ALIGN
+    values_offset += padding
+    index_offset = 0
+    size = values_offset + n * ct.vals.itemsize
+    if indexed:
+        index_offset = size + -size % _ALIGN
+        size = index_offset + 2 * n * array('i').itemsize
+    f.write(_HEADER.pack(MAGIC, VERSION, ct.typecode.encode(), INDEXED if indexed else 0,
+                         n, values_offset, index_offset))
+
+    left = memoryview(ct.left)
+    right = memoryview(ct.right)
+    for start in range(0, n, _CHUNK_NODES):
+        stop = min(start + _CHUNK_NODES, n)
+        codes = bytes((l != NIL) | ((r != NIL) << 1)
+                      for l, r in zip(left[start:stop], right[start:stop]))
+        codes += bytes(-len(codes) % 4)
+        f.write(bytes(a | (b << 2) | (c << 4) | (d << 6)
+                      for a, b, c, d in zip(codes[0::4], codes[1::4],
+                                            codes[2::4], codes[3::4])))
+    f.write(bytes(padding))
+
+    _write_buffer(f, ct.vals, ct.typecode)
+    if indexed:
+        f.write(bytes(index_offset - values_offset - n * ct.vals.itemsize))
+        _write_buffer(f, ct.left, 'i')
+        _write_buffer(f, ct.right, 'i')
+    return size
+
+
+def dumps_tree(tree, typecode='i', indexed=False):
+    """
+    Дерево (Tree/Node любого задания или CompactTree) в байтах формата
+    файла - тот же код, что у write_tree, но в BytesIO. Узлы идут в прямом
+    порядке, поэтому при чтении структура восстанавливается по одним
+    битам, без индексов детей; indexed=True добавляет и индексы
+    (8 байт на узел) - тогда разбирать структуру не нужно.
+    """
+    f = io.BytesIO()
+    _write(f, _as_preorder(tree, typecode), indexed)
+    return f.getvalue()
+
+
+def write_tree(tree, path, typecode='i', indexed=True):
+    """
+    Записывает дерево в файл (формат - см. dumps_tree), возвращает размер.
+    По умолчанию с индексами детей: load_tree тогда не разбирает структуру.
+    """
+    ct = _as_preorder(tree, typecode)
+    with open(path, 'wb') as f:
+        return _write(f, ct, indexed)
+
+
+def read_header(buf):
+    """Разбирает заголовок: (typecode, N, смещение значений, смещение индексов или 0)."""
+    magic, version, typecode, flags, n, values_offset, index_offset = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError("Это не файл дерева")
+    if version != VERSION:
+        raise ValueError(f"Неподдерживаемая версия формата: {version}")
+    return typecode.decode(), n, values_offset, index_offset if flags & INDEXED else 0
+
+
+def _decode_structure(buf, n):
+    """
+    Один линейный проход по битам структуры: индексы детей в прямом
+    порядке. Следующий узел - левый ребенок текущего, если он есть,
+    иначе правый ребенок ближайшего предка, ждущего своей очереди.
+    """
+    left = array('i', [NIL]) * n
+    right = array('i', [NIL]) * n
+    # Места для подвешивания: 2 * индекс родителя + (0 - левый, 1 - правый)
+    pending = array('l')
+    slot = -1
+    i = 0
+    for byte in buf[_HEADER.size:_HEADER.size + (n + 3) // 4]:
+        for code in _UNPACK[byte]:
+            if i == n:
+                break
+            if slot >= 0:
+                if slot & 1:
+                    right[slot >> 1] = i
+                else:
+                    left[slot >> 1] = i
+            if code & 2:
+                pending.append(2 * i + 1)
+            if code & 1:
+                slot = 2 * i
+            elif pending:
+                slot = pending.pop()
+            else:
+                slot = -1
+            i += 1
+    return left, right
+
+
+def _view(buf, offset, n, typecode, copy):
+    """
+    Массив из n значений typecode по смещению offset: memoryview без
+    копирования или (copy=True, а также на big-endian машине) array.
+    """
+    size = n * array(typecode).itemsize
+    if not copy and not _SWAP:
+        return memoryview(buf)[offset:offset + size].cast(typecode)
+    values = array(typecode)
+    values.frombytes(buf[offset:offset + size])
+    if _SWAP:
+        values.byteswap()
+    return values
+
+
+def _load(buf, copy):
+    typecode, n, values_offset, index_offset = read_header(buf)
+    ct = CompactTree(typecode)
+    ct.vals = _view(buf, values_offset, n, typecode, copy)
+    if index_offset:
+        ct.left = _view(buf, index_offset, n, 'i', copy)
+        ct.right = _view(buf, index_offset + n * array('i').itemsize, n, 'i', copy)
+    else:
+        ct.left, ct.right = _decode_structure(buf, n)
+    return ct
+
+
+def loads_tree(buf):
+    """
+    CompactTree из байтов dumps_tree (bytes, bytearray, memoryview).
+    Буферы копируются в array, поэтому исходные байты можно сразу освободить.
+    """
+    return _load(buf, True)
+
+
+def load_tree(path):
+    """
+    Открывает файл через mmap и возвращает CompactTree. Буферы не
+    копируются: vals (и left/right у файла с индексами) - memoryview
+    (только чтение) прямо на страницы файла, поэтому открытие не зависит
+    от N, а несколько процессов, открывших один файл, делят одну копию в
+    кеше ОС. Без индексов дети восстанавливаются за один проход по 2 битам
+    на узел. На big-endian машине буферы копируются с перестановкой байт.
+    """
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    # memoryview держат ссылку на mmap, отображение живет вместе с деревом
+    return _load(mm, False)
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    from compact_tree import find_paths_in_range
+    from tree_builders import build_tree
+
+    path = os.path.join(tempfile.gettempdir(), 'tree_io_demo.bin')
+    for n in (100000, 1000000):
+        ct = build_tree(n, 'random', seed=1, compact=True)
+        for indexed in (False, True):
+            start = time.perf_counter()
+            size = write_tree(ct, path, indexed=indexed)
+            mid = time.perf_counter()
+            loaded = load_tree(path)
+            end = time.perf_counter()
+
+            same = (loaded.left.tolist() == ct.left.tolist() and
+                    loaded.right.tolist() == ct.right.tolist() and
+                    loaded.vals.tolist() == ct.vals.tolist())
+            print(f"N={n}, индексы {'есть' if indexed else 'нет '}: файл {size / 2**20:.2f} МБ "
+                  f"({size * 8 / n:.1f} бит/узел), запись {mid - start:.3f} сек, "
+                  f"чтение {end - mid:.5f} сек, совпадает: {same}")
+            print(f"    пути длиной [0, 5] совпадают: "
+                  f"{find_paths_in_range(loaded, 0, 5) == find_paths_in_range(ct, 0, 5)}")
+            del loaded
+    os.remove(path)
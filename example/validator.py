@@ -0,0 +1,245 @@
+import time
+from array import array
+
+from compact_tree import CompactTree, NIL
+
+# Проверяемые свойства - битовые флаги, комбинируются через |
+BST = 1          # строгое дерево поиска: левые < узел < правые
+AVL = 2          # BST + высоты детей отличаются не больше чем на 1
+MIN_HEAP = 4     # полное дерево + родитель <= детей
+MAX_HEAP = 8     # полное дерево + родитель >= детей
+COMPLETE = 16    # все уровни заполнены, последний - слева направо
+PERFECT = 32     # все уровни заполнены целиком
+LINEAR = 64      # у каждого узла не больше одного ребенка
+RANGE = 128      # все значения в value_range = (c, d) включительно
+HEIGHT = 256     # высота (кол-во узлов) строго в height_window = (A, B)
+
+ALL = BST | AVL | MIN_HEAP | MAX_HEAP | COMPLETE | PERFECT | LINEAR | RANGE | HEIGHT
+
+PROPERTY_NAMES = {
+    BST: 'BST', AVL: 'AVL', MIN_HEAP: 'MIN_HEAP', MAX_HEAP: 'MAX_HEAP',
+    COMPLETE: 'COMPLETE', PERFECT: 'PERFECT', LINEAR: 'LINEAR',
+    RANGE: 'RANGE', HEIGHT: 'HEIGHT',
+}
+
+INF = float('inf')
+N_INF = float('-inf')
+
+# Пустое место для ребенка в стеке validate_compact
+_SLOT = NIL
+
+
+def names(mask):
+    """Имена свойств, входящих в маску."""
+    return [name for flag, name in PROPERTY_NAMES.items() if mask & flag]
+
+
+def validate(tree, props=ALL, value_range=None, height_window=None):
+    """
+    Проверяет выбранные свойства дерева (Tree или корневой Node любого
+    задания) и возвращает маску тех из них, что выполняются. Дерево
+    раскладывается в CompactTree (typecode - по значениям), проверка -
+    validate_compact.
+    """
+    return validate_compact(CompactTree.from_tree(tree, None), props,
+                            value_range, height_window)
+
+
+def validate_compact(ct, props=ALL, value_range=None, height_window=None, root=0):
+    """
+    Проверяет выбранные свойства CompactTree (или дерева из леса в общих
+    буферах - см. forest_validate) за один итеративный обход и возвращает
+    маску тех из них, что выполняются. root - индекс корня проверяемого
+    дерева.
+
+    Почти все свойства проверяются сверху вниз, при входе в узел:
+      - BST - границы (lo, hi), унаследованные от предков;
+      - кучи, LINEAR, RANGE - сравнение узла с его детьми;
+      - HEIGHT - по глубине: высота дерева - это максимальная глубина;
+      - COMPLETE/PERFECT - по пустым местам для детей, которые обход
+        слева направо встречает по порядку: у полного дерева их глубины
+        сначала равны D, потом D-1 и не растут, у идеального - все равны.
+    Снизу вверх нужен только баланс АВЛ: лишь тогда в стек кладется
+    второй кадр узла, а высоты детей лежат в отдельном array.
+    Кадр стека - индекс узла и его глубина/границы в параллельных
+    массивах, без кортежей. Как только все запрошенные свойства
+    опровергнуты, обход прекращается.
+
+    Пустое дерево удовлетворяет всем свойствам, кроме HEIGHT (A < 0 < B).
+    """
+    if props & RANGE and value_range is None:
+        raise ValueError("Для RANGE нужен value_range=(c, d)")
+    if props & HEIGHT and height_window is None:
+        raise ValueError("Для HEIGHT нужен height_window=(A, B)")
+    c, d = value_range if value_range is not None else (N_INF, INF)
+    A, B = height_window if height_window is not None else (N_INF, INF)
+
+    if root < 0 or root >= len(ct.vals):
+        return props & ~HEIGHT | (props & HEIGHT if A < 0 < B else 0)
+
+    # Кучи требуют полноты; АВЛ - свойства дерева поиска
+    alive = props
+    need = props
+    if need & (MIN_HEAP | MAX_HEAP):
+        need |= COMPLETE
+    if need & AVL:
+        need |= BST
+    check_bst = need & BST
+    check_avl = need & AVL
+    check_slots = need & (COMPLETE | PERFECT)
+    check_min = need & MIN_HEAP
+    check_max = need & MAX_HEAP
+    check_linear = need & LINEAR
+    check_range = need & RANGE
+    check_height = need & HEIGHT
+
+    vals = ct.vals
+    left_of = ct.left
+    right_of = ct.right
+    complete = perfect = True
+    slot_depth = -1
+    shallow = False
+    max_depth = 0
+
+    # Кадр: nodes[k] (_SLOT - пустое место для ребенка: правое учитывается
+    # только после левого поддерева), depths[k], los[k], his[k];
+    # отрицательная глубина - второй кадр (выход из узла) для АВЛ
+    nodes = array('l', (root,))
+    depths = array('l', (1,))
+    los = [N_INF]
+    his = [INF]
+    heights = array('l')
+
+    while nodes:
+        i = nodes.pop()
+        depth = depths.pop()
+        lo = los.pop()
+        hi = his.pop()
+
+        if i == _SLOT:
+            # Пустое место на глубине depth (правый ребенок)
+            if slot_depth < 0:
+                slot_depth = depth
+            elif depth != slot_depth:
+                perfect = False
+                if depth == slot_depth - 1 and not shallow:
+                    shallow = True
+                elif depth != slot_depth - 1:
+                    complete = False
+            elif shallow:
+                complete = False
+            if not complete:
+                alive &= ~(COMPLETE | MIN_HEAP | MAX_HEAP)
+            if not perfect:
+                alive &= ~PERFECT
+            if not alive:
+                return 0
+            continue
+
+        left = left_of[i]
+        right = right_of[i]
+        if depth < 0:
+            # Выход из узла: высоты детей уже в стеке высот
+            if not check_avl:
+                continue
+            hr = heights.pop() if right >= 0 else 0
+            hl = heights.pop() if left >= 0 else 0
+            if hl - hr > 1 or hr - hl > 1:
+                alive &= ~AVL
+                check_avl = 0
+                if not alive:
+                    return 0
+            heights.append((hl if hl > hr else hr) + 1)
+            continue
+
+        v = vals[i]
+        if depth > max_depth:
+            max_depth = depth
+            if check_height and depth >= B:
+                alive &= ~HEIGHT
+                check_height = 0
+
+        if check_bst and not (lo < v < hi):
+            alive &= ~(BST | AVL)
+            check_bst = 0
+            check_avl = 0
+        if check_range and not (c <= v <= d):
+            alive &= ~RANGE
+            check_range = 0
+        if check_linear and left >= 0 and right >= 0:
+            alive &= ~LINEAR
+            check_linear = 0
+        if check_min or check_max:
+            for child in (left, right):
+                if child >= 0:
+                    cv = vals[child]
+                    if check_min and cv < v:
+                        alive &= ~MIN_HEAP
+                        check_min = 0
+                    if check_max and cv > v:
+                        alive &= ~MAX_HEAP
+                        check_max = 0
+        if not alive:
+            return 0
+        # Опровергнутые свойства больше не проверяются, если они не нужны другим
+        if not alive & (COMPLETE | PERFECT | MIN_HEAP | MAX_HEAP):
+            check_slots = 0
+
+        if check_avl:
+            nodes.append(i)
+            depths.append(-depth)
+            los.append(lo)
+            his.append(hi)
+        child_depth = depth + 1
+        if right >= 0:
+            nodes.append(right)
+            depths.append(child_depth)
+            los.append(v)
+            his.append(hi)
+        elif check_slots:
+            nodes.append(_SLOT)
+            depths.append(child_depth)
+            los.append(lo)
+            his.append(hi)
+        if left >= 0:
+            nodes.append(left)
+            depths.append(child_depth)
+            los.append(lo)
+            his.append(v)
+        elif check_slots:
+            nodes.append(_SLOT)
+            depths.append(child_depth)
+            los.append(lo)
+            his.append(hi)
+
+    if not (A < max_depth < B):
+        alive &= ~HEIGHT
+    return alive & props
+
+
+if __name__ == "__main__":
+    from compact_tree import check_tree_properties
+    from tree_builders import build_tree
+
+    # Та же задача, что check_tree_properties из task2.1, одним вызовом
+    t = build_tree(1000, 'bst', seed=1, values=range(1000))
+    mask = validate(t, LINEAR | RANGE | AVL | HEIGHT, value_range=(0, 2000), height_window=(5, 20))
+    print(f"Свойства: {names(mask)}")
+    print(f"check_tree_properties: {check_tree_properties(CompactTree.from_tree(t), 5, 20, 0, 2000)}")
+
+    print("\n=== Ранний выход ===")
+    n = 500000
+    cases = (
+        ("BST, случайное дерево", build_tree(n, 'random', seed=2), BST),
+        ("BST, настоящее BST", build_tree(n, 'bst', seed=2, values=range(n)), BST),
+        ("все свойства, BST", build_tree(n, 'bst', seed=2, values=range(n)), ALL),
+        ("кучи, полное дерево", build_tree(n, 'complete', seed=2, values=range(n)),
+         MIN_HEAP | MAX_HEAP),
+    )
+    for title, tree, props in cases:
+        # Раскладка в CompactTree - O(N) всегда, ранний выход - в самой проверке
+        ct = CompactTree.from_tree(tree, None)
+        start = time.perf_counter()
+        mask = validate_compact(ct, props, value_range=(0, n), height_window=(0, 100))
+        elapsed = time.perf_counter() - start
+        print(f"{title:<22} N={n}: {elapsed:.4f} сек, {names(mask)}")